@@ -5,18 +5,58 @@ import time
 import math
 import json
 import os
+import bisect
 import sys
-import webbrowser
+import threading
 from pathlib import Path # pathlib is great for path manipulation
 import platform
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from collections import defaultdict
 import numpy as np
-from typing import Dict, List, Tuple, Set, Optional, Union
+from typing import Dict, List, Tuple, Set, Optional, Union, NamedTuple
 import ctypes
 
+_SYSTEM = platform.system() # Cached: platform.system() shells out to uname on POSIX
+
+try:
+    import orjson # Optional: much faster JSON encode/decode for user data
+except ImportError:
+    orjson = None
+
+# matplotlib is slow to import and only needed for the Statistics tab, so it is loaded on first use
+Figure = None
+MaxNLocator = None
+mdates = None
+FigureCanvasTkAgg = None
+
+
+def _ensure_mpl():
+    """Imports matplotlib the first time charts are needed.
+
+    Figures are built directly and embedded with FigureCanvasTkAgg, so pyplot
+    (and its global figure manager / interactive backend) is never loaded.
+    """
+    global Figure, MaxNLocator, mdates, FigureCanvasTkAgg
+    if Figure is not None:
+        return
+    import matplotlib
+    matplotlib.rcParams['agg.path.chunksize'] = 10000 # Render long lines in chunks instead of one huge Agg path
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MaxNLocator
+    import matplotlib.dates as mdates
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+def set_chart_style(colors):
+    """Themes every chart created afterwards through rcParams instead of per-artist setters."""
+    import matplotlib
+    text = colors["TEXT_COLOR"]
+    matplotlib.rcParams.update({
+        "figure.facecolor": colors["BG_COLOR"], "axes.facecolor": colors["BG_COLOR"],
+        "axes.edgecolor": text, "axes.labelcolor": text, "axes.titlecolor": text, "text.color": text,
+        "xtick.color": text, "ytick.color": text, "xtick.labelsize": 7, "ytick.labelsize": 7,
+        "axes.labelsize": 8, "axes.titlesize": 9,
+        "legend.fontsize": 7, "legend.labelcolor": text, "legend.facecolor": colors["SECONDARY_COLOR"], "legend.edgecolor": text,
+    })
 
 
 def set_app_user_model_id(app_id_str: str):
@@ -24,20 +64,115 @@ def set_app_user_model_id(app_id_str: str):
     Sets the Application User Model ID for the current process.
     This helps Windows group windows and use the correct taskbar icon.
     """
-    if platform.system() == "Windows":
-        try:
-            ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(app_id_str)
-            # print(f"AppUserModelID set to: {app_id_str}") # For debugging
-        except AttributeError:
-            print("Failed to set AppUserModelID: Attribute error (ctypes or shell32 issue).")
-        except Exception as e:
-            print(f"Failed to set AppUserModelID: {e}")
+    if _SYSTEM != "Windows":
+        return
+    try:
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(app_id_str)
+        # print(f"AppUserModelID set to: {app_id_str}") # For debugging
+    except AttributeError:
+        print("Failed to set AppUserModelID: Attribute error (ctypes or shell32 issue).")
+    except Exception as e:
+        print(f"Failed to set AppUserModelID: {e}")
+
+
+def fit_lines(x, *ys):
+    """Least-squares straight lines through (x, y) for each y, returned as callables.
+
+    Closed form (dot products) instead of np.polyfit(x, y, 1), which goes
+    through an SVD for what are at most ten points here. Series sharing the
+    same x are fitted in one matrix product.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.column_stack(ys).astype(np.float64, copy=False)
+    x_mean, y_mean = x.mean(), y.mean(axis=0)
+    dx = x - x_mean
+    denom = dx @ dx
+    slopes = (dx @ (y - y_mean)) / denom if denom else np.zeros(len(ys))
+    intercepts = y_mean - slopes * x_mean
+    return tuple((lambda k, m=m, b=b: m * k + b) for m, b in zip(slopes.tolist(), intercepts.tolist()))
 
 
+def fit_line(x, y):
+    return fit_lines(x, y)[0]
+
+
+def get_randomized_fluctuation_pattern(historical_data, num_pattern_sessions, horizon_length, fit_degree=1, amplitude_variation_factor=0.2):
+    """Wave pattern for the predicted lines: residuals of the recent sessions around their local trend,
+    repeated over the horizon with a random phase and amplitude per repetition."""
+    if len(historical_data) < num_pattern_sessions or num_pattern_sessions < 2:
+        return np.zeros(horizon_length) 
+
+    pattern_data = np.array(historical_data[-num_pattern_sessions:])
+    pattern_indices = np.arange(len(pattern_data))
+    
+    try:
+        if fit_degree == 1:
+            local_trend_line = fit_line(pattern_indices, pattern_data)(pattern_indices)
+        else:
+            local_trend_line = np.polyval(np.polyfit(pattern_indices, pattern_data, fit_degree), pattern_indices) # No poly1d wrapper
+        residuals_base = pattern_data - local_trend_line 
+        
+        generated_fluctuations = np.zeros(horizon_length)
+        len_residuals = len(residuals_base)
+
+        for i in range(0, horizon_length, len_residuals):
+            segment_len = min(len_residuals, horizon_length - i)
+            random_amplitude_scale = 1.0 + random.uniform(-amplitude_variation_factor, amplitude_variation_factor)
+            start_index_in_residuals = random.randint(0, len_residuals -1)
+            
+            # Residuals rotated to the random start, as one fancy-indexing gather
+            segment_idx = (start_index_in_residuals + np.arange(segment_len)) % len_residuals
+            generated_fluctuations[i : i + segment_len] = residuals_base[segment_idx] * random_amplitude_scale
+        
+        return generated_fluctuations
+    except np.linalg.LinAlgError: 
+        return np.zeros(horizon_length)
+
+
+class QuestionDetails(NamedTuple):
+    """The question currently on screen; fixed fields, so a tuple instead of a dict."""
+    text: str
+    answer: Union[int, float]
+    op_type: str
+    num1: int
+    num2: int
+    raw_question: Optional[tuple]
 
 
 class MathSpeedTrainer:
 
+    MAX_WRONG_QUESTIONS = 30 # Oldest entries roll off once the practice lists are full
+    MAX_SLOW_QUESTIONS = 20
+    BASIC_OPERATIONS = frozenset(("addition", "subtraction", "multiplication", "division"))
+    FONT_9 = ("Segoe UI", 9) # Shared body font spec
+    MC_DISTRACTOR_OFFSETS = (-3, -2, -1, 1, 2, 3) # Multiples of the answer-sized step used for wrong choices
+    SESSION_ROWS_PER_PAGE = 50 # Session history rows added to the overview list per scroll-to-bottom
+    # XP needed to reach each level, precomputed for the levels players realistically reach
+    _XP_TABLE = tuple(100 if lvl <= 1 else int(100 * (1.5 ** (lvl - 1))) for lvl in range(256))
+    _XP_BEYOND_TABLE = {} # Filled lazily for levels past _XP_TABLE
+    # Columnar copy of session_history used by the stats charts, one extractor per column
+    _SESSION_COLUMNS = {
+        "ts": lambda s: s.get("ts") or 0,
+        "duration": lambda s: s.get("actual_duration") or 0,
+        "correct": lambda s: s.get("correct") or 0,
+        "incorrect": lambda s: (s.get("total") or 0) - (s.get("correct") or 0),
+        "level": lambda s: s.get("level_at_end") or 1,
+        "avg_time": lambda s: s.get("avg_time") or 0,
+    }
+    # Precompiled row templates for the session listboxes; fields missing from old sessions fall back to these
+    _SESSION_ROW_DEFAULTS = {"correct": 0, "total": 0, "accuracy": 0, "avg_time": 0, "level_at_end": "-"}
+    _HOME_ROW_FMT = "{date} L{level_at_end}|{correct}/{total} ({accuracy:.0f}%)|{avg_time:.1f}s".format_map # Compacted
+    _HISTORY_ROW_FMT = "{date}: {correct}/{total} ({accuracy:.0f}%) {avg_time:.1f}s".format_map # Compact
+    # Question text for stored practice questions, by op type; the rest use "n1 op n2"
+    _PRACTICE_Q_FORMATS = {"powers": "{0}^{1} = ?", "roots_sq": "√{0} = ?", "roots_cu": "∛{0} = ?", "percentages": "{0}% of {1} = ?"}
+    # Subplot margins recorded from tight_layout for each fixed-size chart, so no layout solver runs on draw
+    CHART_MARGINS = {
+        "overview": dict(left=0.12, right=0.97, top=0.94, bottom=0.19),
+        "operations": dict(left=0.09, right=0.98, top=0.87, bottom=0.27, wspace=0.2),
+        "progress": dict(left=0.09, right=0.98, top=0.95, bottom=0.17),
+        "predictions": dict(left=0.08, right=0.91, top=0.89, bottom=0.42), # Legend sits below the axes
+    }
+
     def resource_path(self, relative_path):
         """Get absolute path to resource, works for dev and PyInstaller"""
         try:
@@ -75,7 +210,7 @@ class MathSpeedTrainer:
 
         # --- Determine User Data Directory and File ---
         app_name = "MathSpeedTrainer"
-        system = platform.system()
+        system = _SYSTEM
 
         if system == "Windows":
             base_dir = Path(os.getenv('APPDATA', Path.home() / "AppData" / "Roaming"))
@@ -100,26 +235,27 @@ class MathSpeedTrainer:
                                    parent=self.root)
 
         self.user_data_file = self.user_data_dir / "math_trainer_user_data.json"
+        self.sessions_file = self.user_data_dir / "math_trainer_sessions.jsonl" # One JSON object per finished session, append-only
 
         # --- App State Initializations ---
         self.current_frame = None
         self.game_active = False
         self.practice_active = False
         self.game_end_time = None
-        self.current_question_details: Optional[Dict] = None
+        self.current_question_details: Optional[QuestionDetails] = None
         self.question_start_time = None
         
         self.questions_answered = 0 
         self.correct_answers = 0    
-        self.session_operation_times = defaultdict(list)
-        self.session_operation_correct = defaultdict(int)
-        self.session_operation_incorrect = defaultdict(int)
         
-        self.persistently_wrong_questions = [] 
-        self.persistently_slow_questions = []  
+        # Keyed by question_key(), in insertion order so the oldest entry is dropped first
+        self.persistently_wrong_questions = {} 
+        self.persistently_slow_questions = {}  
         
         self.current_practice_type = None 
         self.current_practice_list = []
+        self.current_practice_mc_options = None # Per-entry MC options for wrong/slow lists
+        self._practice_iter = None # Yields (question_data, mc_options) for wrong/slow lists
         self.current_practice_op_for_session = None 
 
         self.current_level = 1
@@ -132,12 +268,15 @@ class MathSpeedTrainer:
             "addition": True, "subtraction": True, "multiplication": True, "division": True,
             "powers": False, "roots": False, "percentages": False
         }
+        self.update_enabled_ops()
         self.answer_mode = "text"
         
-        self.operation_stats = {
-            op: {"correct": 0, "incorrect": 0, "avg_time": 0.0, "total_answered_for_avg": 0}
-            for op in self.operations.keys()
-        }
+        self.operation_stats = {op: self.empty_op_stats() for op in self.operations.keys()}
+        # Per-operation running time totals and answer counts for the current session; only their ratio is reported
+        self.session_operation_time_sum = {op: 0.0 for op in self.operations}
+        self.session_operation_count = {op: 0 for op in self.operations}
+        self.session_operation_correct = {op: 0 for op in self.operations}
+        self.session_operation_incorrect = {op: 0 for op in self.operations}
         
         self.difficulty_brackets = [
             (1, 5, {"range": (1, 10), "digits": 1}),
@@ -148,6 +287,9 @@ class MathSpeedTrainer:
             (31, 50, {"range": (100, 1000), "digits": 3, "mult_range": (10, 100)}),
             (51, 100, {"range": (100, 9999), "digits": 4, "mult_range": (10, 200)})
         ]
+        self._bracket_max_levels = [max_lvl for _, max_lvl, _ in self.difficulty_brackets] # Sorted, for bisect lookup
+        self._difficulty_params_cache = {} # (level, self-assessment) -> difficulty params
+        self._hint_builders = {op: getattr(self, f"hint_{op}") for op in ("addition", "subtraction", "multiplication", "division", "powers", "roots", "percentages")}
         
         self.overview_canvas_info = None
         self.operations_canvas_info = None
@@ -155,7 +297,14 @@ class MathSpeedTrainer:
         self.predictions_canvas_info = None
         self.overall_time_trend_canvas_info = None
         self.op_time_trend_canvases_info = {}
+        self._pending_op_trends = {} # Tk path of an unopened per-operation tab -> (tab, op name)
+        self._fig_pool = {} # Chart key -> Figure, cleared and redrawn instead of reallocated on rebuilds
+        self.time_trends_layout = None # (theme, which charts exist) of the built Time Trends tab
         self.pred_text_widget_ref = None 
+        self.session_listbox = None # Created with the Overview tab
+        self.home_session_listbox = None
+        self._rng = np.random.default_rng()
+        self._prediction_noise = None # Scratch buffer for the predicted-line noise, reused across refreshes
 
         self.practice_questions_total = 0
         self.practice_questions_answered = 0
@@ -164,11 +313,26 @@ class MathSpeedTrainer:
         self.initial_assessment_done = False 
         self.self_assessment_level = "good"  
 
+        self._dirty = False # Set whenever persisted state changes; save_user_data is skipped while False
+        self._save_after_id = None # Pending debounced save from request_save
+        self._save_lock = threading.Lock() # Serializes writers of the data file
+        self._save_thread = None # Background auto-save writer, if one has been started
+        self._xp_dirty = False # An XP/level label refresh is queued
+        # Set once the widgets of each tab exist, so updaters need no per-widget hasattr checks
+        self._home_ui_built = False
+        self._game_ui_built = False
+        self._practice_ui_built = False
+        self._stats_ui_built = False
+        # Text of the frequently updated labels; they outlive tab rebuilds and are bound via textvariable
+        self.level_text = tk.StringVar(root)
+        self.xp_text = tk.StringVar(root)
+        self.timer_text = tk.StringVar(root)
+        self.score_text = tk.StringVar(root)
+
         self.load_user_data() 
         self.apply_theme() 
 
         self.notebook = ttk.Notebook(root, style="TNotebook")
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10) # Reduced padding
         
         self.home_frame = ttk.Frame(self.notebook, padding=15) # Reduced padding
         self.game_frame = ttk.Frame(self.notebook, padding=15) # Reduced padding
@@ -187,12 +351,15 @@ class MathSpeedTrainer:
         self.setup_practice_frame()
         self.setup_stats_frame()
         self.setup_settings_frame()
+        # Packed only once every tab is built, so the geometry manager lays the tree out in one pass
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10) # Reduced padding
         
         self.root.bind("<Return>", self.handle_return_key)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_main_tab_changed)
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.auto_save_timer_id = self.root.after(300000, self.auto_save)
 
-        self.root.after(200, self.prompt_initial_assessment)
+        self.root.after_idle(self.prompt_initial_assessment) # Runs once the main window has been laid out
 
 
     def define_color_palettes(self):
@@ -206,6 +373,7 @@ class MathSpeedTrainer:
             "ENTRY_BORDER": "#CCCCCC", "TREEVIEW_BG": "#FFFFFF", "TREEVIEW_FG": "#333333",
             "TREEVIEW_HEADING_BG": "#0078D4", "TREEVIEW_HEADING_FG": "#FFFFFF",
             "TREEVIEW_HEADING_BG_ACTIVE": "#005A9E", "PROGRESS_TROUGH": "#D0D0D0", "TAB_ACTIVE_BG": "#D0D0D0",
+            "PINK_BUTTON_BG": "#FF80AB", "PINK_BUTTON_ACTIVE_BG": "#F06292",
         }
         self.dark_theme_colors = {
             "BG_COLOR": "#2B2B2B", "TEXT_COLOR": "#D0D0D0", "PRIMARY_COLOR": "#0078D4", 
@@ -217,6 +385,7 @@ class MathSpeedTrainer:
             "ENTRY_BORDER": "#555555", "TREEVIEW_BG": "#313335", "TREEVIEW_FG": "#D0D0D0",
             "TREEVIEW_HEADING_BG": "#0078D4", "TREEVIEW_HEADING_FG": "#FFFFFF",
             "TREEVIEW_HEADING_BG_ACTIVE": "#005A9E", "PROGRESS_TROUGH": "#555555", "TAB_ACTIVE_BG": "#4F5254",
+            "PINK_BUTTON_BG": "#E91E63", "PINK_BUTTON_ACTIVE_BG": "#C2185B",
         }
         self.colors = self.light_theme_colors
 
@@ -231,6 +400,8 @@ class MathSpeedTrainer:
         self.style.configure("LevelInfo.TLabel", font=("Segoe UI Semibold", 12))
 
         self.style.configure("TButton", font=("Segoe UI Semibold", 10), padding=(8, 4), borderwidth=0) # Reduced padding
+        self.style.configure("MCQ.TButton", font=("Segoe UI Semibold", 12), padding=(10,6))
+        self.style.configure("Pink.TButton", font=("Segoe UI Semibold", 9), padding=(6,3)) # Adjusted
 
         self.style.configure("TNotebook", borderwidth=0)
         self.style.configure("TNotebook.Tab", font=("Segoe UI Semibold", 10), padding=(8, 4)) # Reduced padding
@@ -241,16 +412,74 @@ class MathSpeedTrainer:
         self.style.configure("TProgressbar", thickness=15) # Reduced thickness
         
         self.style.configure("TEntry", font=("Segoe UI", 11), padding=4, relief="flat") # Adjusted
-        self.style.configure("TSpinbox", font=("Segoe UI", 9), padding=2, relief="flat", arrowsize=10) # Adjusted
+        self.style.configure("TSpinbox", font=self.FONT_9, padding=2, relief="flat", arrowsize=10) # Adjusted
 
 
         self.style.configure("Treeview.Heading", font=("Segoe UI Semibold", 9), relief="flat") # Reduced
-        self.style.configure("Treeview", rowheight=22, font=("Segoe UI", 9)) # Reduced
-        
-        self.style.configure("TRadiobutton", font=("Segoe UI", 9)) # Reduced
-        self.style.configure("TCheckbutton", font=("Segoe UI", 9)) # Reduced
-        self.style.configure("TCombobox", font=("Segoe UI", 9)) # Reduced
-
+        self.style.configure("Treeview", rowheight=22, font=self.FONT_9) # Reduced
+        
+        self.style.configure("TRadiobutton", font=self.FONT_9) # Reduced
+        self.style.configure("TCheckbutton", font=self.FONT_9) # Reduced
+        self.style.configure("TCombobox", font=self.FONT_9) # Reduced
+
+
+    def theme_style_settings(self):
+        c = self.colors
+        return {
+            "TFrame": {"configure": {"background": c["BG_COLOR"]}},
+            "TLabel": {"configure": {"background": c["BG_COLOR"], "foreground": c["TEXT_COLOR"]}},
+            "Header.TLabel": {"configure": {"foreground": c["PRIMARY_COLOR"], "background": c["BG_COLOR"]}},
+            "SubHeader.TLabel": {"configure": {"foreground": c["PRIMARY_COLOR"], "background": c["BG_COLOR"]}},
+            "Question.TLabel": {"configure": {"foreground": c["TEXT_COLOR"], "background": c["BG_COLOR"]}},
+            "Timer.TLabel": {"configure": {"foreground": c["ACCENT_COLOR_RED"], "background": c["BG_COLOR"]}},
+            "Score.TLabel": {"configure": {"foreground": c["TEXT_COLOR"], "background": c["BG_COLOR"]}},
+            "LevelInfo.TLabel": {"configure": {"foreground": c["PRIMARY_COLOR"], "background": c["BG_COLOR"]}},
+
+            "TButton": {"map": {"background": [('active', c["PRIMARY_COLOR_ACTIVE"]), ('!disabled', c["PRIMARY_COLOR"])],
+                                "foreground": [('!disabled', c["BUTTON_TEXT_COLOR"])]}},
+            "Green.TButton": {"configure": {"background": c["ACCENT_COLOR_GREEN"], "foreground": c["BUTTON_TEXT_COLOR"]},
+                              "map": {"background": [('active', c["ACCENT_GREEN_ACTIVE"])]}},
+            "Red.TButton": {"configure": {"background": c["ACCENT_COLOR_RED"], "foreground": c["BUTTON_TEXT_COLOR"]},
+                            "map": {"background": [('active', c["ACCENT_RED_ACTIVE"])]}},
+            "Accent.TButton": {"configure": {"background": c["PRIMARY_COLOR"], "foreground": c["BUTTON_TEXT_COLOR"]},
+                               "map": {"background": [('active', c["PRIMARY_COLOR_ACTIVE"])]}},
+            "MCQ.TButton": {"configure": {"background": c["PRIMARY_COLOR"], "foreground": c["BUTTON_TEXT_COLOR"]},
+                            "map": {"background": [('active', c["PRIMARY_COLOR_ACTIVE"])]}},
+            "Pink.TButton": {"configure": {"background": c["PINK_BUTTON_BG"], "foreground": "#FFFFFF"},
+                             "map": {"background": [('active', c["PINK_BUTTON_ACTIVE_BG"])]}},
+
+            "TNotebook": {"configure": {"background": c["BG_COLOR"]}},
+            "TNotebook.Tab": {"configure": {"background": c["SECONDARY_COLOR"], "foreground": c["TEXT_COLOR"]},
+                              "map": {"background": [("selected", c["PRIMARY_COLOR"]), ('active', c["TAB_ACTIVE_BG"])],
+                                      "foreground": [("selected", c["BUTTON_TEXT_COLOR"]), ('active', c["TEXT_COLOR"])]}},
+
+            "TLabelframe": {"configure": {"background": c["SECONDARY_COLOR"], "bordercolor": c["PRIMARY_COLOR"]}},
+            "TLabelframe.Label": {"configure": {"background": c["SECONDARY_COLOR"], "foreground": c["PRIMARY_COLOR"]}},
+
+            "TProgressbar": {"configure": {"background": c["ACCENT_COLOR_GREEN"], "troughcolor": c["PROGRESS_TROUGH"]}},
+
+            "TEntry": {"configure": {"fieldbackground": c["ENTRY_BG"], "foreground": c["ENTRY_FG"], "bordercolor": c["ENTRY_BORDER"], "lightcolor": c["ENTRY_BORDER"], "darkcolor": c["ENTRY_BORDER"]},
+                       "map": {"bordercolor": [('focus', c["PRIMARY_COLOR"])]}},
+            "TSpinbox": {"configure": {"fieldbackground": c["ENTRY_BG"], "foreground": c["ENTRY_FG"], "bordercolor": c["ENTRY_BORDER"], "background": c["ENTRY_BG"], "troughcolor": c["SECONDARY_COLOR"]}, # troughcolor for arrows bg
+                         "map": {"bordercolor": [('focus', c["PRIMARY_COLOR"])]}},
+
+            "Secondary.TFrame": {"configure": {"background": c["SECONDARY_COLOR"]}},
+            "Treeview.Heading": {"configure": {"background": c["TREEVIEW_HEADING_BG"], "foreground": c["TREEVIEW_HEADING_FG"]},
+                                 "map": {"background": [('active', c["TREEVIEW_HEADING_BG_ACTIVE"])]}},
+            "Treeview": {"configure": {"background": c["TREEVIEW_BG"], "fieldbackground": c["TREEVIEW_BG"], "foreground": c["TREEVIEW_FG"]}},
+
+            "TRadiobutton": {"configure": {"background": c["SECONDARY_COLOR"], "foreground": c["TEXT_COLOR"]},
+                             "map": {"indicatorcolor": [('selected', c["PRIMARY_COLOR"]), ('!selected', c["TEXT_COLOR"])],
+                                     "foreground": [('active', c["PRIMARY_COLOR"])]}},
+            "TCheckbutton": {"configure": {"background": c["SECONDARY_COLOR"], "foreground": c["TEXT_COLOR"]},
+                             "map": {"indicatorcolor": [('selected', c["PRIMARY_COLOR"]), ('!selected', c["TEXT_COLOR"])],
+                                     "foreground": [('active', c["PRIMARY_COLOR"])]}},
+
+            "TCombobox": {"map": {"fieldbackground": [('readonly', c["ENTRY_BG"])],
+                                  "selectbackground": [('readonly', c["ENTRY_BG"])],
+                                  "selectforeground": [('readonly', c["ENTRY_FG"])],
+                                  "foreground": [('readonly', c["ENTRY_FG"])]}},
+        }
 
     def apply_theme(self):
         if self.theme == "dark":
@@ -259,103 +488,32 @@ class MathSpeedTrainer:
             self.colors = self.light_theme_colors
 
         self.root.configure(bg=self.colors["BG_COLOR"])
+        c = self.colors
+        # Listbox colour options, resolved once per theme and splatted into every tk.Listbox
+        self.listbox_colors = {"bg": c["LISTBOX_BG"], "fg": c["TEXT_COLOR"],
+                               "selectbackground": c["LISTBOX_SELECT_BG"], "selectforeground": c["LISTBOX_SELECT_FG"]}
 
-        self.style.configure("TFrame", background=self.colors["BG_COLOR"])
-        self.style.configure("TLabel", background=self.colors["BG_COLOR"], foreground=self.colors["TEXT_COLOR"])
-        self.style.configure("Header.TLabel", foreground=self.colors["PRIMARY_COLOR"], background=self.colors["BG_COLOR"])
-        self.style.configure("SubHeader.TLabel", foreground=self.colors["PRIMARY_COLOR"], background=self.colors["BG_COLOR"])
-        self.style.configure("Question.TLabel", foreground=self.colors["TEXT_COLOR"], background=self.colors["BG_COLOR"])
-        self.style.configure("Timer.TLabel", foreground=self.colors["ACCENT_COLOR_RED"], background=self.colors["BG_COLOR"])
-        self.style.configure("Score.TLabel", foreground=self.colors["TEXT_COLOR"], background=self.colors["BG_COLOR"])
-        self.style.configure("LevelInfo.TLabel", foreground=self.colors["PRIMARY_COLOR"], background=self.colors["BG_COLOR"])
-
-        self.style.map("TButton",
-                       background=[('active', self.colors["PRIMARY_COLOR_ACTIVE"]), ('!disabled', self.colors["PRIMARY_COLOR"])],
-                       foreground=[('!disabled', self.colors["BUTTON_TEXT_COLOR"])])
-        self.style.configure("Green.TButton", background=self.colors["ACCENT_COLOR_GREEN"], foreground=self.colors["BUTTON_TEXT_COLOR"])
-        self.style.map("Green.TButton", background=[('active', self.colors["ACCENT_GREEN_ACTIVE"])])
-        self.style.configure("Red.TButton", background=self.colors["ACCENT_COLOR_RED"], foreground=self.colors["BUTTON_TEXT_COLOR"])
-        self.style.map("Red.TButton", background=[('active', self.colors["ACCENT_RED_ACTIVE"])])
-        self.style.configure("Accent.TButton", background=self.colors["PRIMARY_COLOR"], foreground=self.colors["BUTTON_TEXT_COLOR"])
-        self.style.map("Accent.TButton", background=[('active', self.colors["PRIMARY_COLOR_ACTIVE"])])
-
-        self.style.configure("TNotebook", background=self.colors["BG_COLOR"])
-        self.style.configure("TNotebook.Tab", background=self.colors["SECONDARY_COLOR"], foreground=self.colors["TEXT_COLOR"])
-        self.style.map("TNotebook.Tab",
-                       background=[("selected", self.colors["PRIMARY_COLOR"]), ('active', self.colors["TAB_ACTIVE_BG"])],
-                       foreground=[("selected", self.colors["BUTTON_TEXT_COLOR"]), ('active', self.colors["TEXT_COLOR"])])
-
-        self.style.configure("TLabelframe", background=self.colors["SECONDARY_COLOR"], bordercolor=self.colors["PRIMARY_COLOR"])
-        self.style.configure("TLabelframe.Label", background=self.colors["SECONDARY_COLOR"], foreground=self.colors["PRIMARY_COLOR"])
-
-        self.style.configure("TProgressbar", background=self.colors["ACCENT_COLOR_GREEN"], troughcolor=self.colors["PROGRESS_TROUGH"])
-        
-        self.style.configure("TEntry", fieldbackground=self.colors["ENTRY_BG"], foreground=self.colors["ENTRY_FG"], bordercolor=self.colors["ENTRY_BORDER"], lightcolor=self.colors["ENTRY_BORDER"], darkcolor=self.colors["ENTRY_BORDER"])
-        self.style.map("TEntry", bordercolor=[('focus', self.colors["PRIMARY_COLOR"])])
-        
-        self.style.configure("TSpinbox", fieldbackground=self.colors["ENTRY_BG"], foreground=self.colors["ENTRY_FG"], bordercolor=self.colors["ENTRY_BORDER"], background=self.colors["ENTRY_BG"], troughcolor=self.colors["SECONDARY_COLOR"]) # troughcolor for arrows bg
-        self.style.map("TSpinbox", bordercolor=[('focus', self.colors["PRIMARY_COLOR"])])
-
-        self.style.configure("Secondary.TFrame", background=self.colors["SECONDARY_COLOR"])
-        self.style.configure("Treeview.Heading", background=self.colors["TREEVIEW_HEADING_BG"], foreground=self.colors["TREEVIEW_HEADING_FG"])
-        self.style.map("Treeview.Heading", background=[('active', self.colors["TREEVIEW_HEADING_BG_ACTIVE"])])
-        self.style.configure("Treeview", background=self.colors["TREEVIEW_BG"], fieldbackground=self.colors["TREEVIEW_BG"], foreground=self.colors["TREEVIEW_FG"])
-        
-        self.style.configure("TRadiobutton", background=self.colors["SECONDARY_COLOR"], foreground=self.colors["TEXT_COLOR"])
-        self.style.map("TRadiobutton", indicatorcolor=[('selected', self.colors["PRIMARY_COLOR"]), ('!selected', self.colors["TEXT_COLOR"])],
-                                      foreground=[('active', self.colors["PRIMARY_COLOR"])]) 
-        self.style.configure("TCheckbutton", background=self.colors["SECONDARY_COLOR"], foreground=self.colors["TEXT_COLOR"])
-        self.style.map("TCheckbutton", indicatorcolor=[('selected', self.colors["PRIMARY_COLOR"]), ('!selected', self.colors["TEXT_COLOR"])],
-                                       foreground=[('active', self.colors["PRIMARY_COLOR"])])
-        
-        self.style.map('TCombobox', fieldbackground=[('readonly', self.colors["ENTRY_BG"])])
-        self.style.map('TCombobox', selectbackground=[('readonly', self.colors["ENTRY_BG"])]) 
-        self.style.map('TCombobox', selectforeground=[('readonly', self.colors["ENTRY_FG"])]) 
-        self.style.map('TCombobox', foreground=[('readonly', self.colors["ENTRY_FG"])])      
+        # All ttk colour settings go to Tk as a single script instead of one call per style
+        self.style.theme_settings("clam", self.theme_style_settings())
         self.root.option_add("*TCombobox*Listbox*Background", self.colors["LISTBOX_BG"])
         self.root.option_add("*TCombobox*Listbox*Foreground", self.colors["TEXT_COLOR"])
         self.root.option_add("*TCombobox*Listbox*selectBackground", self.colors["LISTBOX_SELECT_BG"])
         self.root.option_add("*TCombobox*Listbox*selectForeground", self.colors["LISTBOX_SELECT_FG"])
 
-        mcq_button_bg = self.colors["PRIMARY_COLOR"]
-        mcq_button_active_bg = self.colors["PRIMARY_COLOR_ACTIVE"]
-        mcq_button_fg = self.colors["BUTTON_TEXT_COLOR"]
-        self.style.configure("MCQ.TButton", background=mcq_button_bg, foreground=mcq_button_fg, font=("Segoe UI Semibold", 12), padding=(10,6)) # Added font/padding
-        self.style.map("MCQ.TButton", background=[('active', mcq_button_active_bg)])
-
-        if hasattr(self, 'weakness_list'):
-            self.weakness_list.configure(bg=self.colors["LISTBOX_BG"], fg=self.colors["TEXT_COLOR"], 
-                                         selectbackground=self.colors["LISTBOX_SELECT_BG"], selectforeground=self.colors["LISTBOX_SELECT_FG"])
-        if hasattr(self, 'session_listbox'):
-            self.session_listbox.configure(bg=self.colors["LISTBOX_BG"], fg=self.colors["TEXT_COLOR"],
-                                           selectbackground=self.colors["LISTBOX_SELECT_BG"], selectforeground=self.colors["LISTBOX_SELECT_FG"])
-        if hasattr(self, 'pred_text_widget_ref') and self.pred_text_widget_ref: 
+        if self._practice_ui_built:
+            self.weakness_list.configure(**self.listbox_colors)
+        if self.session_listbox and self.session_listbox.winfo_exists(): # Overview may not be rebuilt yet
+            self.session_listbox.configure(**self.listbox_colors)
+        if self.pred_text_widget_ref: 
              self.pred_text_widget_ref.configure(bg=self.colors["BG_COLOR"], fg=self.colors["TEXT_COLOR"])
-        if hasattr(self, 'hint_label'):
+        if self._practice_ui_built:
             self.hint_label.configure(foreground=self.colors["PRIMARY_COLOR"])
 
 
-        if hasattr(self, 'home_session_listbox') and self.home_session_listbox:
-            self.home_session_listbox.configure(
-                bg=self.colors["LISTBOX_BG"], fg=self.colors["TEXT_COLOR"],
-                selectbackground=self.colors["LISTBOX_SELECT_BG"], 
-                selectforeground=self.colors["LISTBOX_SELECT_FG"]
-            )
-
-        if self.theme == "dark":
-            pink_button_bg = "#E91E63"
-            pink_button_active_bg = "#C2185B"
-            pink_button_fg = "#FFFFFF"
-        else: 
-            pink_button_bg = "#FF80AB"
-            pink_button_active_bg = "#F06292"
-            pink_button_fg = "#FFFFFF" 
-
-        self.style.configure("Pink.TButton", background=pink_button_bg, foreground=pink_button_fg, font=("Segoe UI Semibold", 9), padding=(6,3)) # Adjusted
-        self.style.map("Pink.TButton", background=[('active', pink_button_active_bg)])
-
+        if self.home_session_listbox:
+            self.home_session_listbox.configure(**self.listbox_colors)
 
-        if hasattr(self, 'stats_notebook'): 
+        if self._stats_ui_built: 
             self.refresh_stats()
 
     def prompt_initial_assessment(self):
@@ -367,6 +525,7 @@ class MathSpeedTrainer:
         assessment_window.geometry("420x330") # Reduced size
         assessment_window.resizable(False, False)
         assessment_window.transient(self.root)
+        self.root.update_idletasks() # Let pending geometry/redraws of the main window finish first
         assessment_window.grab_set() 
         assessment_window.protocol("WM_DELETE_WINDOW", lambda: None) 
 
@@ -398,6 +557,7 @@ class MathSpeedTrainer:
         def submit_assessment():
             self.self_assessment_level = assessment_var.get()
             self.initial_assessment_done = True
+            self._dirty = True
             self.save_user_data() 
             assessment_window.destroy()
             self.root.attributes('-disabled', False)
@@ -412,10 +572,16 @@ class MathSpeedTrainer:
 
     def calculate_xp_for_level(self, level):
         if level <= 1: return 100
-        return int(100 * (1.5 ** (level - 1)))
+        if level < len(self._XP_TABLE): return self._XP_TABLE[level]
+        xp = self._XP_BEYOND_TABLE.get(level)
+        if xp is None: # Past the precomputed table; each level's value is worked out once
+            xp = self._XP_BEYOND_TABLE[level] = int(100 * (1.5 ** (level - 1)))
+        return xp
 
     def on_closing(self):
         print("Attempting to close application...") 
+        if self._save_thread is not None:
+            self._save_thread.join(timeout=2) # Let a pending auto-save finish before the final save
         try:
             print("Saving user data...")
             self.save_user_data()
@@ -424,7 +590,7 @@ class MathSpeedTrainer:
             print(f"Error saving data on close: {e}")
 
         try:
-            if hasattr(self, 'auto_save_timer_id') and self.auto_save_timer_id:
+            if self.auto_save_timer_id:
                 print(f"Cancelling auto_save_timer: {self.auto_save_timer_id}")
                 self.root.after_cancel(self.auto_save_timer_id)
                 self.auto_save_timer_id = None 
@@ -448,39 +614,203 @@ class MathSpeedTrainer:
         
 
     def auto_save(self):
-        self.save_user_data()
+        # Snapshot on the UI thread, then do the file write/fsync in the background
+        if self._dirty and not (self._save_thread and self._save_thread.is_alive()):
+            try:
+                buf = self.encode_user_data()
+                self._dirty = False
+                self._save_thread = threading.Thread(target=self.background_write, args=(buf,), daemon=True)
+                self._save_thread.start()
+            except Exception as e:
+                print(f"Auto-save failed: {e}")
         self.auto_save_timer_id = self.root.after(300000, self.auto_save)
+
+    def background_write(self, buf):
+        try:
+            self.write_user_data(buf)
+        except Exception as e:
+            print(f"Auto-save failed: {e}")
+            self.root.after(0, self.mark_dirty) # Retry on the next save; the flag is only touched on the Tk thread
+
+    def mark_dirty(self):
+        self._dirty = True
     
     def load_user_data(self):
-        if os.path.exists(self.user_data_file):
-            try:
-                with open(self.user_data_file, "r") as f:
-                    user_data = json.load(f)
-                self.current_level = user_data.get("level", 1)
-                self.current_xp = user_data.get("xp", 0)
-                self.xp_needed = user_data.get("xp_needed", self.calculate_xp_for_level(self.current_level +1))
-                self.operations = user_data.get("operations", self.operations)
-                self.game_duration = user_data.get("game_duration", 60)
-                self.answer_mode = user_data.get("answer_mode", "text")
-                self.theme = user_data.get("theme", "light") 
-                self.persistently_wrong_questions = user_data.get("persistently_wrong_questions", [])
-                self.persistently_slow_questions = user_data.get("persistently_slow_questions", [])
-                self.initial_assessment_done = user_data.get("initial_assessment_done", False)
-                self.self_assessment_level = user_data.get("self_assessment_level", "good")
-
-                loaded_op_stats = user_data.get("operation_stats", {})
-                for op_key in self.operations.keys(): 
-                    if op_key in loaded_op_stats:
-                        self.operation_stats[op_key] = loaded_op_stats[op_key]
-                    else: 
-                         self.operation_stats[op_key] = {"correct": 0, "incorrect": 0, "avg_time": 0.0, "total_answered_for_avg": 0}
-                self.session_history = user_data.get("session_history", [])
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load user data: {e}", parent=self.root)
-        else:
+        legacy_history = None
+        try:
+            with open(self.user_data_file, "rb") as f:
+                raw_data = f.read()
+            user_data = orjson.loads(raw_data) if orjson else json.loads(raw_data)
+            self.current_level = user_data.get("level", 1)
+            self.current_xp = user_data.get("xp", 0)
+            self.xp_needed = user_data.get("xp_needed", self.calculate_xp_for_level(self.current_level +1))
+            self.operations = {**self.operations, **user_data.get("operations", {})} # Keep every known op as a key
+            self.update_enabled_ops()
+            self.game_duration = user_data.get("game_duration", 60)
+            self.answer_mode = user_data.get("answer_mode", "text")
+            self.theme = user_data.get("theme", "light") 
+            self.persistently_wrong_questions = self.load_question_records(user_data.get("persistently_wrong_questions", []), self.MAX_WRONG_QUESTIONS)
+            self.persistently_slow_questions = self.load_question_records(user_data.get("persistently_slow_questions", []), self.MAX_SLOW_QUESTIONS)
+            self.initial_assessment_done = user_data.get("initial_assessment_done", False)
+            self.self_assessment_level = user_data.get("self_assessment_level", "good")
+
+            loaded_op_stats = user_data.get("operation_stats", {})
+            for op_key in self.operations.keys(): 
+                if op_key in loaded_op_stats:
+                    op_stats = loaded_op_stats[op_key]
+                    if "sum_time" not in op_stats: # Migrate the old running-average format
+                        count = op_stats.pop("total_answered_for_avg", 0)
+                        op_stats["sum_time"] = op_stats.pop("avg_time", 0.0) * count
+                        op_stats["count"] = count
+                    self.operation_stats[op_key] = op_stats
+                else: 
+                     self.operation_stats[op_key] = self.empty_op_stats()
+            legacy_history = user_data.get("session_history") # Older saves kept the history in this file
+        except FileNotFoundError: # First run
             self.xp_needed = self.calculate_xp_for_level(self.current_level + 1)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load user data: {e}", parent=self.root)
+        self.load_session_history(legacy_history)
+        self.rebuild_session_columns()
+        self.recount_totals()
 
-    def save_user_data(self):
+    def load_session_history(self, legacy_history):
+        rewrite = False
+        try:
+            with open(self.sessions_file, "rb") as f:
+                self.session_history = []
+                for line in f:
+                    try:
+                        self.session_history.append(orjson.loads(line) if orjson else json.loads(line))
+                    except ValueError:
+                        pass # Blank line, or a last line cut short by a crash mid-append
+        except FileNotFoundError:
+            self.session_history = legacy_history or []
+            rewrite = bool(legacy_history) # Move the history out of the main data file
+        except Exception as e:
+            self.session_history = legacy_history or []
+            messagebox.showerror("Error", f"Failed to load session history: {e}", parent=self.root)
+        for session in self.session_history:
+            if "ts" not in session and "date" in session: # Migrate the old formatted date strings
+                try:
+                    session["ts"] = int(datetime.strptime(session["date"][:16], "%Y-%m-%d %H:%M").timestamp())
+                    del session["date"]
+                    rewrite = True
+                except ValueError:
+                    pass
+        if rewrite:
+            try:
+                self.write_sessions_file()
+                self._dirty = True # Drop the old copy from the main data file on the next save
+            except OSError as e:
+                print(f"Could not write session history: {e}")
+
+    def encode_session(self, session):
+        if orjson:
+            return orjson.dumps(session, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+        return json.dumps(session).encode("utf-8") + b"\n"
+
+    def write_sessions_file(self):
+        tmp_file = self.sessions_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(b"".join(self.encode_session(session) for session in self.session_history))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.sessions_file)
+
+    def append_session_record(self, session_data):
+        # Only the new session is written; the rest of the history is never re-serialized
+        try:
+            with open(self.sessions_file, "ab") as f:
+                f.write(self.encode_session(session_data))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save session: {e}", parent=self.root)
+
+    def recount_totals(self):
+        # All-time answer totals, kept up to date by process_answer_result
+        self._totals = {
+            "q": sum(stats["correct"] + stats["incorrect"] for stats in self.operation_stats.values()),
+            "correct": sum(stats["correct"] for stats in self.operation_stats.values()),
+        }
+
+    def rebuild_session_columns(self):
+        n = len(self.session_history)
+        self._session_line_cache = {} # Formatted overview rows by session index
+        capacity = max(64, 1 << n.bit_length())
+        self._session_hist_np = {}
+        for name, extract in self._SESSION_COLUMNS.items():
+            column = np.zeros(capacity, dtype=np.float64)
+            column[:n] = np.fromiter((extract(s) for s in self.session_history), dtype=np.float64, count=n)
+            self._session_hist_np[name] = column
+        self._session_hist_len = n
+        # Chart x-values: datetimes are created once per session, not on every refresh
+        self._session_dates = [datetime.fromtimestamp(ts) for ts in self.session_column("ts")]
+        self._op_time_series = {} # op -> ([session index], [avg time]) for the per-operation time trends
+        for i, session in enumerate(self.session_history):
+            self.add_op_time_points(i, session)
+
+    def append_session_columns(self, session_data):
+        n = self._session_hist_len
+        for name, extract in self._SESSION_COLUMNS.items():
+            column = self._session_hist_np[name]
+            if n == column.size: # Grow into a new buffer so slices handed to charts stay valid
+                column = self._session_hist_np[name] = np.concatenate((column, np.zeros_like(column)))
+            column[n] = extract(session_data)
+        self._session_hist_len = n + 1
+        self._session_dates.append(datetime.fromtimestamp(self._session_hist_np["ts"][n]))
+        self.add_op_time_points(n, session_data)
+
+    def add_op_time_points(self, index, session):
+        for op_name, perf in session.get("operations_performance", {}).items():
+            xs, ys = self._op_time_series.setdefault(op_name, ([], []))
+            if perf["total"] > 0:
+                xs.append(index)
+                ys.append(perf["avg_time"])
+
+    def session_column(self, name):
+        return self._session_hist_np[name][:self._session_hist_len]
+
+    def session_accuracy(self):
+        correct = self.session_column("correct")
+        total = correct + self.session_column("incorrect")
+        return np.divide(correct * 100, total, out=np.zeros_like(total), where=total > 0)
+
+    def update_enabled_ops(self):
+        # Enabled operations in settings order; rebuilt only when self.operations changes
+        self.enabled_ops = tuple(op for op, enabled in self.operations.items() if enabled)
+
+    def question_key(self, raw_q, op_type):
+        return (tuple(raw_q) if raw_q is not None else None, op_type)
+
+    def remember_question(self, records, record, limit):
+        key = self.question_key(record['raw_q'], record['op_type'])
+        if key in records: return
+        records[key] = record
+        if len(records) > limit:
+            del records[next(iter(records))] # Oldest entry rolls off
+
+    def load_question_records(self, saved, limit):
+        records = {}
+        for record in saved:
+            if record.get('raw_q') is not None:
+                record['raw_q'] = tuple(record['raw_q']) # JSON turns the tuple into a list
+            self.remember_question(records, record, limit)
+        return records
+
+    def format_session_date(self, session, default="N/A"):
+        if "ts" in session:
+            return datetime.fromtimestamp(session["ts"]).strftime("%Y-%m-%d %H:%M")
+        return session.get("date", default)[:16]
+
+    def empty_op_stats(self):
+        return {"correct": 0, "incorrect": 0, "sum_time": 0.0, "count": 0}
+
+    def op_avg_time(self, stats):
+        return stats["sum_time"] / stats["count"] if stats["count"] else 0.0
+
+    def encode_user_data(self):
         user_data = {
             "level": self.current_level,
             "xp": self.current_xp,
@@ -490,21 +820,47 @@ class MathSpeedTrainer:
             "answer_mode": self.answer_mode,
             "theme": self.theme, 
             "operation_stats": self.operation_stats,
-            "session_history": self.session_history,
-            "persistently_wrong_questions": self.persistently_wrong_questions,
-            "persistently_slow_questions": self.persistently_slow_questions,
+            "persistently_wrong_questions": list(self.persistently_wrong_questions.values()),
+            "persistently_slow_questions": list(self.persistently_slow_questions.values()),
             "initial_assessment_done": self.initial_assessment_done,
             "self_assessment_level": self.self_assessment_level,
         }
+        if orjson:
+            return orjson.dumps(user_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(user_data, indent=2).encode("utf-8")
+
+    def write_user_data(self, buf):
+        with self._save_lock:
+            # Write to a temp file first and swap it in, so a crash mid-write can't corrupt the save
+            tmp_file = self.user_data_file.with_suffix(".json.tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(buf)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.user_data_file)
+
+    def save_user_data(self):
+        if not self._dirty:
+            return
         try:
-            with open(self.user_data_file, "w") as f:
-                json.dump(user_data, f, indent=4)
+            self.write_user_data(self.encode_user_data())
+            self._dirty = False
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save user data: {e}", parent=self.root)
 
+    def request_save(self):
+        # Answer paths only mark the data dirty; one write happens a few seconds later, or at the next checkpoint save
+        self._dirty = True
+        if self._save_after_id is None:
+            self._save_after_id = self.root.after(3000, self.flush_save)
+
+    def flush_save(self):
+        self._save_after_id = None
+        self.save_user_data()
+
     def handle_return_key(self, event=None):
         focused_widget = self.root.focus_get()
-        if not hasattr(self, 'notebook') or not self.notebook.tabs():
+        if not self.notebook.tabs():
             return
             
         try:
@@ -519,9 +875,23 @@ class MathSpeedTrainer:
              if self.practice_active and self.answer_mode == "text" and focused_widget == self.practice_answer_entry:
                 self.check_practice_answer()
     
+    def swap_tab_frame(self, notebook, old):
+        # Put an empty frame in the old one's notebook slot; the old subtree is destroyed in one go at idle
+        new = ttk.Frame(notebook, padding=old.cget("padding"))
+        notebook.insert(old, new, text=notebook.tab(old, "text"))
+        if notebook.select() == str(old):
+            notebook.select(new)
+        notebook.forget(old)
+        self.root.after_idle(old.destroy)
+        return new
+
+    def empty_main_tab(self, attr):
+        frame = getattr(self, attr)
+        if frame.winfo_children():
+            setattr(self, attr, self.swap_tab_frame(self.notebook, frame))
+
     def setup_home_frame(self):
-        for widget in self.home_frame.winfo_children():
-            widget.destroy()
+        self.empty_main_tab("home_frame")
 
         title_label = ttk.Label(self.home_frame, text="Math Speed Trainer", style="Header.TLabel")
         title_label.pack(pady=(10, 20), anchor="center")
@@ -533,14 +903,17 @@ class MathSpeedTrainer:
         level_info_frame.pack(pady=(0,8), fill=tk.X)
         level_info_frame.configure(style="Secondary.TFrame") 
 
-        self.level_label = ttk.Label(level_info_frame, text=f"Level: {self.current_level}", style="LevelInfo.TLabel")
+        self.set_text(self.level_text, f"Level: {self.current_level}")
+        self.set_text(self.xp_text, f"XP: {self.current_xp}/{self.xp_needed}")
+        self.level_label = ttk.Label(level_info_frame, textvariable=self.level_text, style="LevelInfo.TLabel")
         self.level_label.pack(side=tk.LEFT, padx=(0,20))
         
-        self.xp_label = ttk.Label(level_info_frame, text=f"XP: {self.current_xp}/{self.xp_needed}", style="LevelInfo.TLabel")
+        self.xp_label = ttk.Label(level_info_frame, textvariable=self.xp_text, style="LevelInfo.TLabel")
         self.xp_label.pack(side=tk.LEFT)
         
         self.xp_progress = ttk.Progressbar(progress_lf, orient="horizontal", length=300, mode="determinate", style="TProgressbar") # Reduced length
         self.xp_progress.pack(pady=(3, 8), fill=tk.X)
+        self._home_ui_built = True
         self.update_xp_display()
         
         buttons_lf = ttk.LabelFrame(self.home_frame, text="Get Started", padding=(15,10)) # Reduced
@@ -563,28 +936,18 @@ class MathSpeedTrainer:
             recent_lf = ttk.LabelFrame(self.home_frame, text="Recent Activity", padding=(15,10)) # Reduced
             recent_lf.pack(pady=15, padx=20, fill=tk.BOTH, expand=True) # Reduced
             
-            self.home_session_listbox = tk.Listbox(recent_lf, font=("Segoe UI", 9), height=recent_frame_height, # Reduced font, height
-                                             relief="flat", borderwidth=1,
-                                             bg=self.colors["LISTBOX_BG"], fg=self.colors["TEXT_COLOR"],
-                                             selectbackground=self.colors["LISTBOX_SELECT_BG"], 
-                                             selectforeground=self.colors["LISTBOX_SELECT_FG"],
-                                             activestyle='none') 
+            self.home_session_listbox = tk.Listbox(recent_lf, font=self.FONT_9, height=recent_frame_height, # Reduced font, height
+                                             relief="flat", borderwidth=1, activestyle='none',
+                                             **self.listbox_colors) 
             self.home_session_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=(0,3))
             
             recent_scrollbar = ttk.Scrollbar(recent_lf, orient="vertical", command=self.home_session_listbox.yview)
             recent_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=(0,3))
-            self.home_session_listbox.config(yscrollcommand=recent_scrollbar.set)
             
-            for session in reversed(self.session_history[-recent_sessions_to_show:]): 
-                date_str = session.get("date", "Unknown")[:16] # Shorter date
-                correct = session.get("correct", 0)
-                total = session.get("total", 0)
-                accuracy = session.get("accuracy", 0)
-                avg_time = session.get("avg_time", 0)
-                level_at_end = session.get("level_at_end", "-")
-                
-                session_text = f"{date_str} L{level_at_end}|{correct}/{total} ({accuracy:.0f}%)|{avg_time:.1f}s" # Compacted
-                self.home_session_listbox.insert(tk.END, session_text)
+            session_lines = [self.session_row(self._HOME_ROW_FMT, session, "Unknown")
+                             for session in reversed(self.session_history[-recent_sessions_to_show:])]
+            self.home_session_listbox.insert(tk.END, *session_lines) # One Tcl call for all rows
+            self.home_session_listbox.config(yscrollcommand=recent_scrollbar.set) # Hooked up after filling so the scrollbar syncs once
         else:
             no_history_lf = ttk.LabelFrame(self.home_frame, text="Recent Activity", padding=10) # Reduced
             no_history_lf.pack(pady=15, padx=20, fill=tk.X)
@@ -592,15 +955,21 @@ class MathSpeedTrainer:
                       font=("Segoe UI Italic", 9), style="TLabel", wraplength=280, justify=tk.CENTER).pack(pady=8)
     
     def update_xp_display(self):
-        if hasattr(self, 'level_label'):
-            self.level_label.config(text=f"Level: {self.current_level}")
-        if hasattr(self, 'xp_label'):
-            self.xp_label.config(text=f"XP: {self.current_xp}/{self.xp_needed}")
-        if hasattr(self, 'xp_progress'):
-            self.xp_progress["maximum"] = self.xp_needed
-            self.xp_progress["value"] = self.current_xp
-        if hasattr(self, 'game_level_label'):
-             self.game_level_label.config(text=f"Level: {self.current_level}")
+        # Several XP changes between idle cycles are drawn once
+        if not self._xp_dirty:
+            self._xp_dirty = True
+            self.root.after_idle(self.flush_xp_display)
+
+    def flush_xp_display(self):
+        self._xp_dirty = False
+        self.set_text(self.level_text, f"Level: {self.current_level}") # Shown on both the home and game tabs
+        self.set_text(self.xp_text, f"XP: {self.current_xp}/{self.xp_needed}")
+        if self._home_ui_built:
+            self.xp_progress.configure(maximum=self.xp_needed, value=self.current_xp)
+
+    def set_text(self, var, text):
+        if var.get() != text: # Skip the write (and the label redraw it triggers) when nothing changed
+            var.set(text)
 
     def start_normal_game_tab(self):
         self.notebook.select(self.game_frame)
@@ -617,27 +986,33 @@ class MathSpeedTrainer:
     def open_settings_tab(self):
         self.notebook.select(self.settings_frame)
 
-    def setup_game_frame(self):
-        for widget in self.game_frame.winfo_children(): widget.destroy() 
+    def on_main_tab_changed(self, event=None):
+        # Stats tabs are only built while the Statistics tab is on screen
+        if self.notebook.select() == str(self.stats_frame) and self._stats_ui_built:
+            self.build_visible_stats_tab()
 
+    def setup_game_frame(self):
+        self.empty_main_tab("game_frame")
         self.game_header = ttk.Frame(self.game_frame, padding=(0, 0, 0, 8)) 
         self.game_header.pack(fill=tk.X, pady=(0, 15)) # Reduced
         timer_frame = ttk.Frame(self.game_header) 
         timer_frame.pack(side=tk.LEFT, padx=(0,15))
         ttk.Label(timer_frame, text="⏳", font=("Segoe UI Symbol", 16), foreground=self.colors["ACCENT_COLOR_RED"]).pack(side=tk.LEFT, padx=(0,3)) # Reduced icon size 
-        self.timer_label = ttk.Label(timer_frame, text=f"Time: {self.game_duration}s", style="Timer.TLabel")
+        self.timer_text.set(f"Time: {self.game_duration}s")
+        self.timer_label = ttk.Label(timer_frame, textvariable=self.timer_text, style="Timer.TLabel")
         self.timer_label.pack(side=tk.LEFT)
         
         level_frame = ttk.Frame(self.game_header)
         level_frame.pack(side=tk.LEFT, padx=(15,15), expand=True) 
         ttk.Label(level_frame, text="🌟", font=("Segoe UI Symbol", 16), foreground=self.colors["PRIMARY_COLOR"]).pack(side=tk.LEFT, padx=(0,3)) # Reduced
-        self.game_level_label = ttk.Label(level_frame, text=f"Level: {self.current_level}", style="LevelInfo.TLabel")
+        self.game_level_label = ttk.Label(level_frame, textvariable=self.level_text, style="LevelInfo.TLabel")
         self.game_level_label.pack(side=tk.LEFT)
         
         score_frame = ttk.Frame(self.game_header)
         score_frame.pack(side=tk.RIGHT, padx=(15,0))
         ttk.Label(score_frame, text="🎯", font=("Segoe UI Symbol", 16), foreground=self.colors["ACCENT_COLOR_GREEN"]).pack(side=tk.LEFT, padx=(0,3)) # Reduced
-        self.score_label = ttk.Label(score_frame, text="Score: 0/0", style="Score.TLabel")
+        self.score_text.set("Score: 0/0")
+        self.score_label = ttk.Label(score_frame, textvariable=self.score_text, style="Score.TLabel")
         self.score_label.pack(side=tk.LEFT)
 
         question_display_lf = ttk.LabelFrame(self.game_frame, text="Current Question", padding=(15, 20)) # Reduced
@@ -661,11 +1036,13 @@ class MathSpeedTrainer:
         for i in range(4):
             btn = ttk.Button(self.mc_answer_frame, text="", style="MCQ.TButton", width=8, # Reduced width
                            command=lambda idx=i: self.check_mc_answer(idx))
+            btn.option_value = None
             btn.grid(row=i//2, column=i%2, padx=8, pady=8, ipadx=10, ipady=5) # Reduced padding
             self.mc_buttons.append(btn)
         
         self.text_answer_frame.pack_forget()
         self.mc_answer_frame.pack_forget()
+        self._game_ui_built = True
         
         self.control_frame = ttk.Frame(self.game_frame, padding=(0,8,0,0)) # Reduced
         self.control_frame.pack(pady=(15,0), side=tk.BOTTOM, fill=tk.X) # Reduced 
@@ -678,13 +1055,13 @@ class MathSpeedTrainer:
         self.stop_button.pack(side=tk.LEFT, padx=8, ipady=4) # Reduced
 
     def update_game_answer_mode_ui(self):
-        if not hasattr(self, 'text_answer_frame'): return 
+        if not self._game_ui_built: return 
 
         if self.game_active: 
             if self.answer_mode == "text":
                 self.mc_answer_frame.pack_forget()
                 self.text_answer_frame.pack() 
-                if hasattr(self, 'answer_entry'): self.answer_entry.focus_set()
+                self.answer_entry.focus_set()
             else: 
                 self.text_answer_frame.pack_forget()
                 self.mc_answer_frame.pack() 
@@ -693,9 +1070,7 @@ class MathSpeedTrainer:
             self.mc_answer_frame.pack_forget()
     
     def setup_practice_frame(self):
-        for widget in self.practice_frame.winfo_children():
-            widget.destroy()
-
+        self.empty_main_tab("practice_frame")
         ttk.Label(self.practice_frame, text="Practice Mode", style="SubHeader.TLabel").pack(pady=(0,10), anchor="center")
         
         self.options_main_frame_practice = ttk.Frame(self.practice_frame) 
@@ -714,9 +1089,8 @@ class MathSpeedTrainer:
         weakness_frame = ttk.LabelFrame(self.targeted_op_practice_options_frame, text="Your Weaknesses", padding=8) # Reduced
         weakness_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,8))
         
-        self.weakness_list = tk.Listbox(weakness_frame, font=("Segoe UI", 9), height=4, relief="flat", borderwidth=1, # Reduced font, height
-                                        bg=self.colors["LISTBOX_BG"], fg=self.colors["TEXT_COLOR"],
-                                        selectbackground=self.colors["LISTBOX_SELECT_BG"], selectforeground=self.colors["LISTBOX_SELECT_FG"])
+        self.weakness_list = tk.Listbox(weakness_frame, font=self.FONT_9, height=4, relief="flat", borderwidth=1, # Reduced font, height
+                                        **self.listbox_colors)
         self.weakness_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         weakness_scrollbar = ttk.Scrollbar(weakness_frame, orient="vertical", command=self.weakness_list.yview)
         weakness_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -727,14 +1101,15 @@ class MathSpeedTrainer:
         
         op_select_frame = ttk.Frame(practice_options_lf)
         op_select_frame.pack(fill=tk.X, pady=3)
-        ttk.Label(op_select_frame, text="Op:", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(0,3)) # Reduced text
+        ttk.Label(op_select_frame, text="Op:", font=self.FONT_9).pack(side=tk.LEFT, padx=(0,3)) # Reduced text
         self.practice_operation_var = tk.StringVar(value="Based on weakness")
         self.practice_op_combobox = ttk.Combobox(op_select_frame, textvariable=self.practice_operation_var, state="readonly", width=15, style="TCombobox") # Reduced width
         self.practice_op_combobox.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        self._op_combobox_values = None # Values last handed to the combobox
         
         q_count_frame = ttk.Frame(practice_options_lf)
         q_count_frame.pack(fill=tk.X, pady=3)
-        ttk.Label(q_count_frame, text="Qty:", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(0,3)) # Reduced text
+        ttk.Label(q_count_frame, text="Qty:", font=self.FONT_9).pack(side=tk.LEFT, padx=(0,3)) # Reduced text
         self.practice_question_count_var = tk.IntVar(value=10)
         self.practice_q_count_combobox = ttk.Combobox(q_count_frame, textvariable=self.practice_question_count_var, state="readonly", width=4, style="TCombobox") # Reduced width
         self.practice_q_count_combobox.pack(side=tk.LEFT)
@@ -763,6 +1138,7 @@ class MathSpeedTrainer:
         for i in range(4): # Uses TButton with general styles
             btn = ttk.Button(self.practice_mc_frame, text="", style="MCQ.TButton", width=8, # Adjusted width
                            command=lambda idx=i: self.check_practice_mc_answer(idx))
+            btn.option_value = None
             btn.grid(row=i//2, column=i%2, padx=3, pady=3, ipadx=8, ipady=4) # Reduced padding
             self.practice_mc_buttons.append(btn)
 
@@ -774,36 +1150,39 @@ class MathSpeedTrainer:
         self.practice_submit_button = ttk.Button(self.practice_control_buttons_frame, text="Submit", command=self.check_practice_answer, style="Accent.TButton", width=10) # Reduced text, width
         self.next_practice_q_button = ttk.Button(self.practice_control_buttons_frame, text="Next", command=self.next_practice_question, style="Accent.TButton", width=10) # Reduced text, width
         self.stop_practice_button = ttk.Button(self.practice_control_buttons_frame, text="Stop", command=self.end_practice_session, style="Red.TButton", width=10) # Reduced text, width
+        self._practice_buttons_shown = (False, False) # (Submit, Next) currently packed
+        self._practice_ui_built = True
 
         self.update_weakness_list() 
         self.update_practice_answer_mode_ui()
         self.show_targeted_op_practice_options() 
 
     def update_practice_answer_mode_ui(self):
-        if not hasattr(self, 'practice_text_answer_frame'): return 
+        if not self._practice_ui_built: return 
 
         if self.answer_mode == "text":
             self.practice_text_answer_frame.pack()
             self.practice_mc_frame.pack_forget()
             if self.practice_active:
-                self.practice_submit_button.pack(side=tk.LEFT, padx=3)
-                if hasattr(self, 'practice_answer_entry'): self.practice_answer_entry.focus_set()
+                self.practice_answer_entry.focus_set()
         else: 
             self.practice_text_answer_frame.pack_forget()
             self.practice_mc_frame.pack()
-            if hasattr(self, 'practice_submit_button'): self.practice_submit_button.pack_forget() 
         
-        if self.practice_active and hasattr(self, 'practice_feedback_label') and self.practice_feedback_label.cget("text") != "":
-            if hasattr(self, 'next_practice_q_button'): self.next_practice_q_button.pack(side=tk.LEFT, padx=3)
-            if self.answer_mode == "text" and hasattr(self, 'practice_submit_button'): self.practice_submit_button.pack_forget()
-        else:
-            if hasattr(self, 'next_practice_q_button'): self.next_practice_q_button.pack_forget()
-            if self.practice_active and self.answer_mode == "text" and hasattr(self, 'practice_submit_button'): 
-                if not self.next_practice_q_button.winfo_ismapped(): # Only show submit if next is not shown
-                    self.practice_submit_button.pack(side=tk.LEFT, padx=3)
+        # Next replaces Submit once the current question has been answered
+        answered = self.practice_active and self.practice_feedback_label.cget("text") != ""
+        self.show_practice_buttons(submit=self.practice_active and self.answer_mode == "text" and not answered, next_q=answered)
+
+    def show_practice_buttons(self, submit, next_q):
+        # Pack or forget the Submit/Next buttons only when their visibility changes
+        if (submit, next_q) == self._practice_buttons_shown: return
+        self._practice_buttons_shown = (submit, next_q)
+        for button, shown in ((self.practice_submit_button, submit), (self.next_practice_q_button, next_q)):
+            if shown: button.pack(side=tk.LEFT, padx=3)
+            else: button.pack_forget()
 
     def show_targeted_op_practice_options(self):
-        if hasattr(self, 'targeted_op_practice_options_frame'):
+        if self._practice_ui_built:
             self.targeted_op_practice_options_frame.pack(fill=tk.X, pady=(0,0))
 
     def start_practice(self): 
@@ -820,12 +1199,11 @@ class MathSpeedTrainer:
         else: 
             self.current_practice_op_for_session = selected_op_display.lower()
 
-        if not self.operations.get(self.current_practice_op_for_session, False) and self.current_practice_op_for_session not in ["addition", "subtraction", "multiplication", "division"]:
-            enabled_ops_list = [op for op, enabled in self.operations.items() if enabled]
-            if not enabled_ops_list:
+        if self.current_practice_op_for_session not in self.enabled_ops and self.current_practice_op_for_session not in self.BASIC_OPERATIONS:
+            if not self.enabled_ops:
                 messagebox.showerror("Error", "No operations enabled in settings.", parent=self.root)
                 return
-            self.current_practice_op_for_session = random.choice(enabled_ops_list)
+            self.current_practice_op_for_session = random.choice(self.enabled_ops)
             messagebox.showinfo("Practice", f"Selected op disabled. Practicing {self.current_practice_op_for_session.capitalize()} instead.", parent=self.root)
 
         self.practice_questions_total = self.practice_question_count_var.get()
@@ -833,9 +1211,10 @@ class MathSpeedTrainer:
         self.practice_correct_answers = 0
         self.practice_active = True
 
-        if hasattr(self, 'options_main_frame_practice'): self.options_main_frame_practice.pack_forget()
-        if hasattr(self, 'practice_area'): self.practice_area.pack(fill=tk.BOTH, expand=True, pady=8)
-        if hasattr(self, 'stop_practice_button'): self.stop_practice_button.pack(side=tk.RIGHT, padx=3)
+        if self._practice_ui_built:
+            self.options_main_frame_practice.pack_forget()
+            self.practice_area.pack(fill=tk.BOTH, expand=True, pady=8)
+            self.stop_practice_button.pack(side=tk.RIGHT, padx=3)
 
 
         self.next_practice_question() 
@@ -846,12 +1225,12 @@ class MathSpeedTrainer:
         self.current_practice_type = list_type 
         
         if list_type == "wrong_ones":
-            self.current_practice_list = list(self.persistently_wrong_questions) 
+            self.current_practice_list = list(self.persistently_wrong_questions.values()) 
             if not self.current_practice_list:
                 messagebox.showinfo("Practice Mistakes", "No mistakes recorded to practice!", parent=self.root)
                 return
         elif list_type == "slow_ones":
-            self.current_practice_list = list(self.persistently_slow_questions)
+            self.current_practice_list = list(self.persistently_slow_questions.values())
             if not self.current_practice_list:
                 messagebox.showinfo("Practice Slow Ones", "No slow questions recorded!", parent=self.root)
                 return
@@ -859,47 +1238,49 @@ class MathSpeedTrainer:
             return
 
         random.shuffle(self.current_practice_list) 
+        # The list is fixed for the session, so MC options are drawn for it in one pass;
+        # kept alongside rather than on the entries, which are the persisted dicts
+        self.current_practice_mc_options = [
+            self.generate_mc_options(q['answer'], self.current_level) for q in self.current_practice_list
+        ] if self.answer_mode == "mc" else None
+        self._practice_iter = iter(zip(
+            self.current_practice_list,
+            self.current_practice_mc_options or [None] * len(self.current_practice_list)))
         self.practice_questions_total = len(self.current_practice_list)
         self.practice_questions_answered = 0
         self.practice_correct_answers = 0
         self.practice_active = True
         
-        if hasattr(self, 'options_main_frame_practice'): self.options_main_frame_practice.pack_forget()
-        if hasattr(self, 'practice_area'): self.practice_area.pack(fill=tk.BOTH, expand=True, pady=8)
-        if hasattr(self, 'stop_practice_button'): self.stop_practice_button.pack(side=tk.RIGHT, padx=3)
+        if self._practice_ui_built:
+            self.options_main_frame_practice.pack_forget()
+            self.practice_area.pack(fill=tk.BOTH, expand=True, pady=8)
+            self.stop_practice_button.pack(side=tk.RIGHT, padx=3)
 
         self.next_practice_question() 
         self.update_practice_answer_mode_ui()
 
     def update_weakness_list(self):
-        if not hasattr(self, 'weakness_list'): return 
+        if not self._practice_ui_built: return 
         self.weakness_list.delete(0, tk.END)
-        weaknesses = []
-        for op, stats in self.operation_stats.items():
-            if not self.operations.get(op, False): continue
-            total_answered = stats["correct"] + stats["incorrect"]
-            if total_answered > 0:
-                accuracy = (stats["correct"] / total_answered) * 100
-                avg_time = stats["avg_time"]
-                weaknesses.append({"name": op.capitalize(), "accuracy": accuracy, "avg_time": avg_time, "total_answered": total_answered})
-        weaknesses.sort(key=lambda x: (x["accuracy"], -x["avg_time"]) if x["total_answered"] >=3 else (101, -x["avg_time"])) # Min 3 for sort prio
-        for weakness in weaknesses:
-            self.weakness_list.insert(tk.END, f"{weakness['name']}: {weakness['accuracy']:.0f}% ({weakness['avg_time']:.1f}s)")
-        
-        if hasattr(self, 'practice_op_combobox'):
-            current_selection = self.practice_operation_var.get()
-            operations_list = ["Based on weakness"] + [op.capitalize() for op in self.operations.keys() if self.operations[op]]
+        ops = [op for op in self.operation_stats if self.operations[op]]
+        correct, incorrect, total, accuracy, avg_time = self.operation_arrays(ops)
+        sort_accuracy = np.where(total >= 3, accuracy, 101) # Min 3 for sort prio
+        order = np.lexsort((-avg_time, sort_accuracy)) # Weakest first; slower breaks ties
+        lines = [f"{ops[i].capitalize()}: {accuracy[i]:.0f}% ({avg_time[i]:.1f}s)" for i in order if total[i] > 0]
+        if lines:
+            self.weakness_list.insert(tk.END, *lines)
+
+        current_selection = self.practice_operation_var.get()
+        operations_list = ("Based on weakness",) + tuple(op.capitalize() for op in self.enabled_ops)
+        if operations_list != self._op_combobox_values: # Only push the list to Tk when it changed
             self.practice_op_combobox['values'] = operations_list
-            if current_selection in operations_list:
-                self.practice_operation_var.set(current_selection)
-            elif operations_list:
-                 self.practice_operation_var.set(operations_list[0])
-            else:
-                self.practice_operation_var.set("")
+            self._op_combobox_values = operations_list
+        if current_selection not in operations_list:
+            self.practice_operation_var.set(operations_list[0])
 
     def setup_stats_frame(self):
-        for widget in self.stats_frame.winfo_children():
-            widget.destroy()
+        self.empty_main_tab("stats_frame")
+        self.discard_cached_charts()
 
         header_frame = ttk.Frame(self.stats_frame)
         header_frame.pack(fill=tk.X, pady=(0, 8)) # Reduced
@@ -919,55 +1300,173 @@ class MathSpeedTrainer:
         self.stats_notebook.add(self.progress_tab, text="Progress")
         self.stats_notebook.add(self.predictions_tab, text="Predictions")
         self.stats_notebook.add(self.time_trends_tab, text="Time Trends") 
-        
-        ttk.Button(self.stats_frame, text="Refresh Stats", command=self.refresh_stats, style="Accent.TButton", width=12).pack(pady=(8,0)) # Reduced width
+
+        # Each stats tab is (re)built the first time it is shown after a refresh
+        # Keyed by tab position, since clearing a tab swaps in a new frame
+        self._stats_tab_builders = (
+            self.setup_overview_tab_content,
+            self.setup_operations_tab_content,
+            self.setup_progress_tab_content,
+            self.setup_predictions_tab_content,
+            self.setup_time_trends_tab_content,
+        )
+        self._stats_tab_state = {} # Tab position -> stats_state() it was last built from
+        self._chart_theme = None # Theme the matplotlib rcParams were last styled for
+        self.stats_notebook.bind("<<NotebookTabChanged>>", self.on_stats_tab_changed)
+        self._stats_ui_built = True
+        
+        ttk.Button(self.stats_frame, text="Refresh Stats", command=lambda: self.refresh_stats(force=True), style="Accent.TButton", width=12).pack(pady=(8,0)) # Reduced width
         self.refresh_stats() 
 
-    def refresh_stats(self):
-        if not hasattr(self, 'overview_tab'): return 
-        self.setup_overview_tab_content(self.overview_tab)
-        self.setup_operations_tab_content(self.operations_tab)
-        self.setup_progress_tab_content(self.progress_tab)
-        self.setup_predictions_tab_content(self.predictions_tab)
-        if hasattr(self, 'time_trends_tab'): 
-            self.setup_time_trends_tab_content(self.time_trends_tab) 
+    def refresh_stats(self, force=False):
+        if not self._stats_ui_built: return 
+        if force:
+            self._stats_tab_state = {}
+        if self.notebook.select() == str(self.stats_frame):
+            self.build_visible_stats_tab()
         self.update_weakness_list()
 
-    def clear_tab_content(self, tab):
-        for widget in tab.winfo_children():
-            widget.destroy()
-        
-        def destroy_canvas_and_fig_from_info(canvas_info_dict):
-            if canvas_info_dict and canvas_info_dict.get('canvas') and canvas_info_dict.get('fig'):
-                try:
-                    if canvas_info_dict['canvas'].get_tk_widget().winfo_exists():
-                        canvas_info_dict['canvas'].get_tk_widget().destroy()
-                    plt.close(canvas_info_dict['fig']) 
-                except Exception as e:
-                    print(f"Error destroying canvas/fig: {e}")
-            return None 
+    def on_stats_tab_changed(self, event=None):
+        if self.notebook.select() == str(self.stats_frame):
+            self.build_visible_stats_tab()
+
+    def stats_state(self):
+        # Everything the stats tabs are drawn from; a tab whose state is unchanged is left as it is
+        return (self._session_hist_len, self._totals["q"], self.current_level, self.current_xp, self.enabled_ops, self.theme)
 
+    def build_visible_stats_tab(self):
+        index = self.stats_notebook.index("current")
+        state = self.stats_state()
+        if self._stats_tab_state.get(index) == state:
+            return
+        self._stats_tab_state[index] = state
+        _ensure_mpl() # Charts wait until the Statistics tab is first opened
+        if self._chart_theme != self.theme:
+            set_chart_style(self.colors)
+            self._chart_theme = self.theme
+            self._fig_pool.clear() # Pooled figures carry the old theme's facecolor
+        self._stats_tab_builders[index](self.stats_notebook.nametowidget(self.stats_notebook.select()))
+
+    def chart_figure(self, layout, figsize, key=None):
+        """Returns the pooled Figure for a chart, cleared for redrawing, creating it on first use."""
+        key = key or layout
+        fig = self._fig_pool.get(key)
+        if fig is None:
+            fig = self._fig_pool[key] = Figure(figsize=figsize)
+        else:
+            fig.clear()
+        fig.subplots_adjust(**self.CHART_MARGINS[layout])
+        return fig
+
+    def embed_chart(self, fig, master):
+        """Packs a Tk canvas for a chart. The charts are display-only, so the mouse and key handlers
+        FigureCanvasTkAgg installs are dropped and pointer movement over them stays in Tk."""
+        canvas = FigureCanvasTkAgg(fig, master=master)
+        widget = canvas.get_tk_widget()
+        for sequence in widget.bind(): # Keeps <Configure>/<Map> so charts still follow the window size
+            if sequence not in ("<Configure>", "<Map>"):
+                widget.unbind(sequence)
+        canvas.draw_idle()
+        widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        return canvas
+
+    def destroy_chart(self, canvas_info_dict):
+        if canvas_info_dict and canvas_info_dict.get('canvas') and canvas_info_dict.get('fig'):
+            try:
+                if canvas_info_dict['canvas'].get_tk_widget().winfo_exists():
+                    canvas_info_dict['canvas'].get_tk_widget().destroy()
+            except Exception as e:
+                print(f"Error destroying canvas/fig: {e}")
+        return None 
+
+    def discard_cached_charts(self):
+        # Cached figures point at widgets of the old stats notebook; drop them before it is rebuilt
+        self.overview_canvas_info = self.destroy_chart(self.overview_canvas_info)
+        self.operations_canvas_info = self.destroy_chart(self.operations_canvas_info)
+        self.progress_canvas_info = self.destroy_chart(self.progress_canvas_info)
+        self.predictions_canvas_info = self.destroy_chart(self.predictions_canvas_info)
+        self.overall_time_trend_canvas_info = None # Time trends are plain Tk canvases, destroyed with their tab
+        self.op_time_trend_canvases_info = {}
+        self.time_trends_layout = None
+        self.pred_text_widget_ref = None
+
+    def clear_tab_content(self, tab):
+        new_tab = self.swap_tab_frame(self.stats_notebook, tab)
         if tab == self.overview_tab:
-            self.overview_canvas_info = destroy_canvas_and_fig_from_info(self.overview_canvas_info)
+            self.overview_tab = new_tab
+            self.overview_canvas_info = self.destroy_chart(self.overview_canvas_info)
         elif tab == self.operations_tab:
-            self.operations_canvas_info = destroy_canvas_and_fig_from_info(self.operations_canvas_info)
+            self.operations_tab = new_tab
+            self.operations_canvas_info = self.destroy_chart(self.operations_canvas_info)
         elif tab == self.progress_tab:
-            self.progress_canvas_info = destroy_canvas_and_fig_from_info(self.progress_canvas_info)
+            self.progress_tab = new_tab
+            self.progress_canvas_info = self.destroy_chart(self.progress_canvas_info)
         elif tab == self.predictions_tab:
-            self.predictions_canvas_info = destroy_canvas_and_fig_from_info(self.predictions_canvas_info)
-            if hasattr(self, 'pred_text_widget_ref'): 
-                self.pred_text_widget_ref = None 
-        elif hasattr(self, 'time_trends_tab') and tab == self.time_trends_tab:
-            self.overall_time_trend_canvas_info = destroy_canvas_and_fig_from_info(self.overall_time_trend_canvas_info)
-            if hasattr(self, 'op_time_trend_canvases_info'):
-                for op_name in list(self.op_time_trend_canvases_info.keys()): 
-                    canvas_info_dict = self.op_time_trend_canvases_info.get(op_name)
-                    if canvas_info_dict: 
-                        destroy_canvas_and_fig_from_info(canvas_info_dict) 
-                self.op_time_trend_canvases_info = {}
+            self.predictions_tab = new_tab
+            self.predictions_canvas_info = self.destroy_chart(self.predictions_canvas_info)
+            self.pred_text_widget_ref = None 
+        elif tab == self.time_trends_tab:
+            self.time_trends_tab = new_tab
+            self.overall_time_trend_canvas_info = None
+            self.op_time_trend_canvases_info = {}
+            self.time_trends_layout = None
+        return new_tab
             
+    def update_overview_values(self):
+        total_questions_all_time = self._totals["q"]
+        total_correct_all_time = self._totals["correct"]
+        accuracy_all_time = (total_correct_all_time / total_questions_all_time * 100) if total_questions_all_time > 0 else 0
+        texts = {
+            "total_q": f"Total Q's: {total_questions_all_time}", # Compact
+            "total_correct": f"Total Correct: {total_correct_all_time}",
+            "accuracy": f"Overall Acc: {accuracy_all_time:.1f}%",
+            "level": f"Current Lvl: {self.current_level}",
+            "xp": f"XP: {self.current_xp}/{self.xp_needed}",
+        }
+        for key, text in texts.items():
+            if self._last_overview_texts.get(key) != text: # Only touch labels whose value changed
+                self.general_labels[key].config(text=text)
+        self._last_overview_texts = texts
+
+    def session_row(self, row_fmt, session, default_date="N/A"):
+        return row_fmt({**self._SESSION_ROW_DEFAULTS, **session, "date": self.format_session_date(session, default_date)})
+
+    def session_line(self, index):
+        line = self._session_line_cache.get(index)
+        if line is None:
+            line = self._session_line_cache[index] = self.session_row(self._HISTORY_ROW_FMT, self.session_history[index])
+        return line
+
+    def fill_session_listbox(self):
+        # The whole history is browsable, but rows are only created a page at a time as the list is scrolled
+        self.session_listbox.delete(0, tk.END)
+        self._history_rows_loaded = 0
+        self.load_more_session_rows()
+
+    def load_more_session_rows(self):
+        n = len(self.session_history)
+        start = self._history_rows_loaded
+        end = min(n, start + self.SESSION_ROWS_PER_PAGE)
+        if start < end:
+            self.session_listbox.insert(tk.END, *(self.session_line(n - 1 - k) for k in range(start, end))) # Newest first
+            self._history_rows_loaded = end
+
+    def on_session_list_scroll(self, first, last):
+        self.history_scrollbar.set(first, last)
+        if float(last) >= 0.95 and self._history_rows_loaded < len(self.session_history):
+            self.load_more_session_rows()
+
     def setup_overview_tab_content(self, tab):
-        self.clear_tab_content(tab)
+        info = self.overview_canvas_info
+        if info and len(self.session_history) >= 2 and info['theme'] == self.theme:
+            # Widgets and chart already exist: refresh their contents in place
+            self.update_overview_values()
+            self.fill_session_listbox()
+            dates = self._session_dates[-10:]
+            self.update_line_chart(info, dates, self.session_accuracy()[-10:])
+            return
+
+        tab = self.clear_tab_content(tab)
         
         top_frame = ttk.Frame(tab)
         top_frame.pack(fill=tk.X, pady=(0,10)) # Reduced
@@ -975,64 +1474,92 @@ class MathSpeedTrainer:
         general_frame = ttk.LabelFrame(top_frame, text="General Stats", padding=10) # Reduced
         general_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,5))
         
-        total_questions_all_time = sum(stats["correct"] + stats["incorrect"] for stats in self.operation_stats.values())
-        total_correct_all_time = sum(stats["correct"] for stats in self.operation_stats.values())
-        accuracy_all_time = (total_correct_all_time / total_questions_all_time * 100) if total_questions_all_time > 0 else 0
-
-        ttk.Label(general_frame, text=f"Total Q's: {total_questions_all_time}", font=("Segoe UI", 9)).pack(anchor="w", pady=1) # Compact
-        ttk.Label(general_frame, text=f"Total Correct: {total_correct_all_time}", font=("Segoe UI", 9)).pack(anchor="w", pady=1)
-        ttk.Label(general_frame, text=f"Overall Acc: {accuracy_all_time:.1f}%", font=("Segoe UI", 9)).pack(anchor="w", pady=1)
-        ttk.Label(general_frame, text=f"Current Lvl: {self.current_level}", font=("Segoe UI", 9)).pack(anchor="w", pady=1)
-        ttk.Label(general_frame, text=f"XP: {self.current_xp}/{self.xp_needed}", font=("Segoe UI", 9)).pack(anchor="w", pady=1)
+        self.general_labels = {}
+        for key in ("total_q", "total_correct", "accuracy", "level", "xp"):
+            self.general_labels[key] = ttk.Label(general_frame, font=self.FONT_9)
+            self.general_labels[key].pack(anchor="w", pady=1)
+        self._last_overview_texts = {}
+        self.update_overview_values()
 
         history_frame = ttk.LabelFrame(top_frame, text="Session History", padding=10) # Reduced
         history_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5,0))
         
         self.session_listbox = tk.Listbox(history_frame, font=("Segoe UI", 8), height=5, relief="flat", borderwidth=1, # Reduced font, height
-                                          bg=self.colors["LISTBOX_BG"], fg=self.colors["TEXT_COLOR"],
-                                          selectbackground=self.colors["LISTBOX_SELECT_BG"], selectforeground=self.colors["LISTBOX_SELECT_FG"])
+                                          **self.listbox_colors)
         self.session_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        history_scrollbar = ttk.Scrollbar(history_frame, orient="vertical", command=self.session_listbox.yview)
-        history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.session_listbox.config(yscrollcommand=history_scrollbar.set)
-        for session in reversed(self.session_history[-15:]): # Show more items in smaller list
-            date = session.get("date", "N/A")[:16] # Shorter date
-            acc = session.get("accuracy", 0)
-            avg_t = session.get("avg_time", 0)
-            self.session_listbox.insert(tk.END, f"{date}: {session['correct']}/{session['total']} ({acc:.0f}%) {avg_t:.1f}s") # Compact
+        self.history_scrollbar = ttk.Scrollbar(history_frame, orient="vertical", command=self.session_listbox.yview)
+        self.history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.fill_session_listbox()
+        self.session_listbox.config(yscrollcommand=self.on_session_list_scroll)
 
         vis_frame = ttk.LabelFrame(tab, text="Accuracy Trend (Last 10 Sessions)", padding=8) # Reduced
         vis_frame.pack(fill=tk.BOTH, expand=True, pady=(8,0))
         if self.session_history and len(self.session_history) >=2 :
             try:
-                fig, ax = plt.subplots(figsize=(5, 2.5))  # Reduced figsize
-                fig.patch.set_facecolor(self.colors["BG_COLOR"]) 
-                ax.set_facecolor(self.colors["BG_COLOR"])
+                fig = self.chart_figure("overview", (5, 2.5))  # Reduced figsize
+                ax = fig.add_subplot(111)
 
-                dates_str = [session["date"] for session in self.session_history[-10:]]
-                dates = [datetime.strptime(d, "%Y-%m-%d %H:%M") for d in dates_str]
-                accuracies = [session["accuracy"] for session in self.session_history[-10:]]
+                dates = self._session_dates[-10:]
+                accuracies = self.session_accuracy()[-10:]
                 
-                ax.plot(dates, accuracies, marker='o', linestyle='-', color=self.colors["PRIMARY_COLOR"], linewidth=1.5, markersize=4) # Smaller marker
+                line, = ax.plot(dates, accuracies, marker='o', linestyle='-', color=self.colors["PRIMARY_COLOR"], linewidth=1.5, markersize=4) # Smaller marker
                 ax.set_ylim(0, 105)
-                ax.set_ylabel("Accuracy (%)", fontdict={'fontsize': 8, 'color': self.colors["TEXT_COLOR"]}) # Reduced fontsize
-                ax.tick_params(axis='x', labelsize=7, colors=self.colors["TEXT_COLOR"], labelrotation=30) # Reduced fontsize, rotation
-                ax.tick_params(axis='y', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced fontsize
-                for spine in ax.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
-                # fig.autofmt_xdate() # Covered by labelrotation
-                plt.tight_layout(pad=1.0) # Reduced pad
+                ax.set_ylabel("Accuracy (%)")
+                # Axis styling is set up once here; refreshes only swap the line data
+                date_locator = mdates.AutoDateLocator(maxticks=6)
+                ax.xaxis.set_major_locator(date_locator)
+                ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(date_locator)) # Short labels, no rotation needed
                 
-                overview_canvas_obj = FigureCanvasTkAgg(fig, master=vis_frame)
-                overview_canvas_obj.draw()
-                overview_canvas_obj.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-                self.overview_canvas_info = {'canvas': overview_canvas_obj, 'fig': fig}
+                overview_canvas_obj = self.embed_chart(fig, vis_frame)
+                self.overview_canvas_info = {'canvas': overview_canvas_obj, 'fig': fig, 'ax': ax, 'line': line, 'theme': self.theme}
             except Exception as e:
                 ttk.Label(vis_frame, text=f"Error generating trend: {e}", font=("Segoe UI", 8)).pack()
         else:
-            ttk.Label(vis_frame, text="No session data for trend.", font=("Segoe UI", 9)).pack(pady=15) # Reduced
+            ttk.Label(vis_frame, text="No session data for trend.", font=self.FONT_9).pack(pady=15) # Reduced
+
+    def operation_arrays(self, ops):
+        # Per-operation columns computed in one vectorised pass: correct, incorrect, total, accuracy %, avg time
+        stats = [self.operation_stats[op] for op in ops]
+        correct = np.fromiter((s["correct"] for s in stats), dtype=np.int64, count=len(ops))
+        incorrect = np.fromiter((s["incorrect"] for s in stats), dtype=np.int64, count=len(ops))
+        sum_time = np.fromiter((s["sum_time"] for s in stats), dtype=np.float64, count=len(ops))
+        count = np.fromiter((s["count"] for s in stats), dtype=np.float64, count=len(ops))
+        total = correct + incorrect
+        accuracy = np.divide(correct * 100.0, total, out=np.zeros(len(ops)), where=total > 0)
+        avg_time = np.divide(sum_time, count, out=np.zeros_like(count), where=count > 0)
+        return correct, incorrect, total, accuracy, avg_time
+
+    def operation_rows(self):
+        ops = list(self.operation_stats)
+        correct, incorrect, total, accuracy, avg_time = self.operation_arrays(ops)
+        rows = [(op_name, (op_name.capitalize(), c, i, t, f"{acc:.0f}", f"{avg_t:.2f}"))
+                for op_name, c, i, t, acc, avg_t in zip(ops, correct.tolist(), incorrect.tolist(), total.tolist(), accuracy.tolist(), avg_time.tolist())]
+        # Chart columns for the operations that have been answered, filtered with one mask
+        played = total > 0
+        chart = {"names": tuple(op.capitalize() for op, p in zip(ops, played.tolist()) if p),
+                 "correct": correct[played], "incorrect": incorrect[played], "avg_time": avg_time[played]}
+        return rows, chart
 
     def setup_operations_tab_content(self, tab): 
-        self.clear_tab_content(tab)
+        rows, chart = self.operation_rows()
+        info = self.operations_canvas_info
+        if info and info['theme'] == self.theme and info['ops'] == chart["names"]:
+            # Same operations charted as before: update changed table rows and bar heights in place
+            shown_rows = info['rows']
+            for op_name, values in rows:
+                if shown_rows.get(op_name) != values:
+                    self.op_tree.item(op_name, values=values)
+                    shown_rows[op_name] = values
+            for bars, key in zip(info['bars'], ("correct", "incorrect", "avg_time")):
+                for bar, height in zip(bars, chart[key].tolist()):
+                    bar.set_height(height)
+            for ax in info['axes']:
+                ax.relim()
+                ax.autoscale_view()
+            info['canvas'].draw_idle()
+            return
+
+        tab = self.clear_tab_content(tab)
         op_stats_lf = ttk.LabelFrame(tab, text="Performance by Operation", padding=10) # Reduced
         op_stats_lf.pack(fill=tk.BOTH, expand=True, pady=(0,8))
         cols = ("operation", "correct", "incorrect", "total", "accuracy", "avg_time")
@@ -1053,197 +1580,179 @@ class MathSpeedTrainer:
         self.op_tree.column("avg_time", width=70, anchor="center") # Adjusted
 
 
-        valid_ops_for_chart = []
-        for op_name, stats in self.operation_stats.items():
-            correct = stats["correct"]
-            incorrect = stats["incorrect"]
-            total = correct + incorrect
-            accuracy = (correct / total * 100) if total > 0 else 0
-            avg_time = stats["avg_time"]
-            self.op_tree.insert("", "end", values=(op_name.capitalize(), correct, incorrect, total, f"{accuracy:.0f}", f"{avg_time:.2f}"))
-            if total > 0:
-                 valid_ops_for_chart.append({
-                    "name": op_name.capitalize(), "correct": correct, "incorrect": incorrect, 
-                    "accuracy": accuracy, "avg_time": avg_time
-                })
+        for op_name, values in rows:
+            self.op_tree.insert("", "end", iid=op_name, values=values)
         self.op_tree.pack(fill=tk.BOTH, expand=True)
 
 
         vis_frame = ttk.LabelFrame(tab, text="Visualizations", padding=8) # Reduced
         vis_frame.pack(fill=tk.BOTH, expand=True, pady=(8,0))
 
-        if valid_ops_for_chart:
+        if chart["names"]:
             try:
-                fig_ops, (ax1, ax2) = plt.subplots(1, 2, figsize=(7, 2.5)) # Reduced figsize
-                fig_ops.patch.set_facecolor(self.colors["BG_COLOR"])
-                ax1.set_facecolor(self.colors["BG_COLOR"])
-                ax2.set_facecolor(self.colors["BG_COLOR"])
+                fig_ops = self.chart_figure("operations", (7, 2.5)) # Reduced figsize
+                ax1, ax2 = fig_ops.subplots(1, 2)
                 
-                op_names_chart = [op['name'] for op in valid_ops_for_chart]
-                correct_counts = [op['correct'] for op in valid_ops_for_chart]
-                incorrect_counts = [op['incorrect'] for op in valid_ops_for_chart]
-                avg_times_list = [op['avg_time'] for op in valid_ops_for_chart]
+                op_names_chart = chart["names"]
 
                 x_indices = np.arange(len(op_names_chart)) 
                 width = 0.35
                 
-                ax1.bar(x_indices - width/2, correct_counts, width, label='Correct', color=self.colors["ACCENT_COLOR_GREEN"])
-                ax1.bar(x_indices + width/2, incorrect_counts, width, label='Incorrect', color=self.colors["ACCENT_COLOR_RED"])
-                ax1.set_title('Correct vs Incorrect', fontsize=9, color=self.colors["TEXT_COLOR"]) # Reduced
+                correct_bars = ax1.bar(x_indices - width/2, chart["correct"], width, label='Correct', color=self.colors["ACCENT_COLOR_GREEN"])
+                incorrect_bars = ax1.bar(x_indices + width/2, chart["incorrect"], width, label='Incorrect', color=self.colors["ACCENT_COLOR_RED"])
+                ax1.set_title('Correct vs Incorrect')
                 ax1.set_xticks(x_indices) 
-                ax1.set_xticklabels(op_names_chart, rotation=30, ha="right", fontsize=7, color=self.colors["TEXT_COLOR"]) # Reduced
-                legend1 = ax1.legend(fontsize=7, facecolor=self.colors["SECONDARY_COLOR"], edgecolor=self.colors["TEXT_COLOR"]) # Reduced
-                for text in legend1.get_texts(): text.set_color(self.colors["TEXT_COLOR"])
-                ax1.set_ylabel("Count", fontsize=8, color=self.colors["TEXT_COLOR"]) # Reduced
-                ax1.tick_params(axis='y', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-                for spine in ax1.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
+                ax1.set_xticklabels(op_names_chart, rotation=30, ha="right")
+                ax1.legend()
+                ax1.set_ylabel("Count")
                 
-                ax2.bar(x_indices, avg_times_list, color=self.colors["PRIMARY_COLOR"]) 
-                ax2.set_title('Average Time', fontsize=9, color=self.colors["TEXT_COLOR"]) # Reduced
-                ax2.set_ylabel('Time (s)', fontsize=8, color=self.colors["TEXT_COLOR"]) # Reduced
+                time_bars = ax2.bar(x_indices, chart["avg_time"], color=self.colors["PRIMARY_COLOR"]) 
+                ax2.set_title('Average Time')
+                ax2.set_ylabel('Time (s)')
                 ax2.set_xticks(x_indices) 
-                ax2.set_xticklabels(op_names_chart, rotation=30, ha="right", fontsize=7, color=self.colors["TEXT_COLOR"]) # Reduced
-                ax2.tick_params(axis='y', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-                for spine in ax2.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
+                ax2.set_xticklabels(op_names_chart, rotation=30, ha="right")
                 
-                plt.tight_layout(pad=1.0) # Reduced
-                canvas_ops_obj = FigureCanvasTkAgg(fig_ops, master=vis_frame)
-                canvas_ops_obj.draw()
-                canvas_ops_obj.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-                self.operations_canvas_info = {'canvas': canvas_ops_obj, 'fig': fig_ops} 
+                canvas_ops_obj = self.embed_chart(fig_ops, vis_frame)
+                self.operations_canvas_info = {'canvas': canvas_ops_obj, 'fig': fig_ops, 'axes': (ax1, ax2), 'theme': self.theme,
+                                               'ops': op_names_chart, 'bars': (correct_bars, incorrect_bars, time_bars),
+                                               'rows': dict(rows)} 
             except Exception as e:
                 ttk.Label(vis_frame, text=f"Error generating charts: {e}", font=("Segoe UI", 8)).pack()
         else:
-            ttk.Label(vis_frame, text="No data for operation charts.", font=("Segoe UI", 9)).pack(pady=15)
+            ttk.Label(vis_frame, text="No data for operation charts.", font=self.FONT_9).pack(pady=15)
+
+    def update_line_chart(self, canvas_info, xs, ys):
+        """Swaps the data of a cached line chart and schedules a redraw."""
+        ax = canvas_info['ax']
+        canvas_info['line'].set_data(xs, ys)
+        ax.relim()
+        ax.autoscale_view()
+        canvas_info['canvas'].draw_idle()
 
     def setup_progress_tab_content(self, tab):
-        self.clear_tab_content(tab)
+        info = self.progress_canvas_info
+        if info and len(self.session_history) >= 2 and info['theme'] == self.theme:
+            # Chart already exists: update the values and line data in place
+            self.progress_level_label.config(text=f"Current Level: {self.current_level}")
+            self.progress_xp_label.config(text=f"XP: {self.current_xp}/{self.xp_needed}")
+            self.progress_xp_bar.config(maximum=self.xp_needed, value=self.current_xp)
+
+            levels_at_session_end = self.session_column("level")
+            session_indices = np.arange(levels_at_session_end.size)
+            ax = info['ax']
+            if len(session_indices) > 10:
+                ax.xaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
+            else:
+                ax.set_xticks(session_indices)
+            ax.set_autoscaley_on(True)
+            self.update_line_chart(info, session_indices, levels_at_session_end)
+            ax.set_ylim(bottom=0.5)
+            return
+
+        tab = self.clear_tab_content(tab)
         
         progress_lf = ttk.LabelFrame(tab, text="Level Progress", padding=10) # Reduced
         progress_lf.pack(fill=tk.X, pady=(0,10))
         
-        ttk.Label(progress_lf, text=f"Current Level: {self.current_level}", style="LevelInfo.TLabel").pack(anchor="w", pady=1)
-        ttk.Label(progress_lf, text=f"XP: {self.current_xp}/{self.xp_needed}", style="LevelInfo.TLabel").pack(anchor="w", pady=1)
+        self.progress_level_label = ttk.Label(progress_lf, text=f"Current Level: {self.current_level}", style="LevelInfo.TLabel")
+        self.progress_level_label.pack(anchor="w", pady=1)
+        self.progress_xp_label = ttk.Label(progress_lf, text=f"XP: {self.current_xp}/{self.xp_needed}", style="LevelInfo.TLabel")
+        self.progress_xp_label.pack(anchor="w", pady=1)
         
-        xp_bar = ttk.Progressbar(progress_lf, orient="horizontal", length=300, mode="determinate", maximum=self.xp_needed, value=self.current_xp, style="TProgressbar") # Reduced length
-        xp_bar.pack(fill=tk.X, pady=(3,0))
+        self.progress_xp_bar = ttk.Progressbar(progress_lf, orient="horizontal", length=300, mode="determinate", maximum=self.xp_needed, value=self.current_xp, style="TProgressbar") # Reduced length
+        self.progress_xp_bar.pack(fill=tk.X, pady=(3,0))
 
         vis_frame = ttk.LabelFrame(tab, text="Level Progression Over Sessions", padding=8) # Reduced
         vis_frame.pack(fill=tk.BOTH, expand=True, pady=(8,0))
         if self.session_history and len(self.session_history) >= 2:
             try:
-                fig, ax = plt.subplots(figsize=(6, 3)) # Reduced figsize
-                fig.patch.set_facecolor(self.colors["BG_COLOR"])
-                ax.set_facecolor(self.colors["BG_COLOR"])
+                fig = self.chart_figure("progress", (6, 3)) # Reduced figsize
+                ax = fig.add_subplot(111)
 
-                session_indices = range(len(self.session_history))
-                levels_at_session_end = [session.get("level_at_end", 1) for session in self.session_history]
+                levels_at_session_end = self.session_column("level")
+                session_indices = np.arange(levels_at_session_end.size)
                 
-                ax.plot(session_indices, levels_at_session_end, marker='o', linestyle='-', color=self.colors["PRIMARY_COLOR"], linewidth=1.5, markersize=4) # Smaller
-                ax.set_xlabel("Session Number", fontsize=8, color=self.colors["TEXT_COLOR"]) # Reduced
-                ax.set_ylabel("Level", fontsize=8, color=self.colors["TEXT_COLOR"]) # Reduced
+                line, = ax.plot(session_indices, levels_at_session_end, marker='o', linestyle='-', color=self.colors["PRIMARY_COLOR"], linewidth=1.5, markersize=4) # Smaller
+                ax.set_xlabel("Session Number")
+                ax.set_ylabel("Level")
                 ax.set_ylim(bottom=0.5)
-                ax.yaxis.set_major_locator(plt.MaxNLocator(integer=True))
-                ax.tick_params(axis='x', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-                ax.tick_params(axis='y', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-                for spine in ax.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
+                ax.yaxis.set_major_locator(MaxNLocator(integer=True))
                 if len(session_indices) > 0:
                     ax.set_xticks(session_indices)
                     if len(session_indices) > 10: # Show fewer ticks if many sessions
-                         ax.xaxis.set_major_locator(plt.MaxNLocator(nbins=8, integer=True))
+                         ax.xaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
 
-                plt.tight_layout(pad=1.0) # Reduced
-                progress_canvas_obj = FigureCanvasTkAgg(fig, master=vis_frame)
-                progress_canvas_obj.draw()
-                progress_canvas_obj.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-                self.progress_canvas_info = {'canvas': progress_canvas_obj, 'fig': fig}
+                progress_canvas_obj = self.embed_chart(fig, vis_frame)
+                self.progress_canvas_info = {'canvas': progress_canvas_obj, 'fig': fig, 'ax': ax, 'line': line, 'theme': self.theme}
             except Exception as e:
                 ttk.Label(vis_frame, text=f"Error generating chart: {e}", font=("Segoe UI", 8)).pack()
         else:
-            ttk.Label(vis_frame, text="No session data for progress chart.", font=("Segoe UI", 9)).pack(pady=15)
+            ttk.Label(vis_frame, text="No session data for progress chart.", font=self.FONT_9).pack(pady=15)
 
 
     def setup_predictions_tab_content(self, tab):
-        self.clear_tab_content(tab) 
-        
-        predictions_info_lf = ttk.LabelFrame(tab, text="Performance Predictions", padding=10) # Reduced
-        predictions_info_lf.pack(fill=tk.X, pady=(0,10))
-
         MIN_SESSIONS_FOR_PREDICTION = 5 # Reduced for earlier predictions
         RECENT_SESSIONS_TO_CONSIDER_FOR_TREND = 10
         RECENT_SESSIONS_FOR_WAVE_PATTERN = 5 
 
+        info = self.predictions_canvas_info
+        # With 5+ sessions there is always an accuracy trend, so an existing chart can be kept and refilled
+        reuse = info is not None and info['theme'] == self.theme and len(self.session_history) >= MIN_SESSIONS_FOR_PREDICTION
+        if not reuse:
+            tab = self.clear_tab_content(tab) 
+            predictions_info_lf = ttk.LabelFrame(tab, text="Performance Predictions", padding=10) # Reduced
+            predictions_info_lf.pack(fill=tk.X, pady=(0,10))
+
         if len(self.session_history) < MIN_SESSIONS_FOR_PREDICTION:
-            ttk.Label(predictions_info_lf, text=f"Need {MIN_SESSIONS_FOR_PREDICTION}+ sessions for predictions.", font=("Segoe UI", 9)).pack(pady=15)
+            ttk.Label(predictions_info_lf, text=f"Need {MIN_SESSIONS_FOR_PREDICTION}+ sessions for predictions.", font=self.FONT_9).pack(pady=15)
             return
 
-        trend_history_slice = self.session_history[-RECENT_SESSIONS_TO_CONSIDER_FOR_TREND:]
+        n_sessions = self._session_hist_len
+        trend_len = min(n_sessions, RECENT_SESSIONS_TO_CONSIDER_FOR_TREND) # Everything below reads the session columns
         
-        avg_times_trend_hist = [s['avg_time'] for s in trend_history_slice if 'avg_time' in s and s['avg_time'] is not None and s['avg_time'] > 0]
-        accuracies_trend_hist = [s['accuracy'] for s in trend_history_slice if 'accuracy' in s and s['accuracy'] is not None]
+        recent_avg_times = self.session_column("avg_time")[-RECENT_SESSIONS_TO_CONSIDER_FOR_TREND:]
+        avg_times_trend_hist = recent_avg_times[recent_avg_times > 0]
+        accuracies_trend_hist = self.session_accuracy()[-RECENT_SESSIONS_TO_CONSIDER_FOR_TREND:]
         
         can_predict_speed = len(avg_times_trend_hist) >= 3 
         can_predict_accuracy = len(accuracies_trend_hist) >= 3
 
         if not (can_predict_speed or can_predict_accuracy):
-            ttk.Label(predictions_info_lf, text="Not enough recent data for trend.", font=("Segoe UI", 9)).pack(pady=15)
+            ttk.Label(predictions_info_lf, text="Not enough recent data for trend.", font=self.FONT_9).pack(pady=15)
             return
 
-        trend_indices_fit_speed = np.arange(len(trend_history_slice) - len(avg_times_trend_hist), len(trend_history_slice)) if can_predict_speed else np.array([])
-        trend_indices_fit_acc = np.arange(len(trend_history_slice) - len(accuracies_trend_hist), len(trend_history_slice)) if can_predict_accuracy else np.array([])
-        
-        session_numbers_plot_trend = np.arange(max(0, len(self.session_history) - RECENT_SESSIONS_TO_CONSIDER_FOR_TREND), len(self.session_history))
+        # Fit indices are only built for the trends that will actually be fitted
+        if can_predict_speed:
+            trend_indices_fit_speed = np.arange(trend_len - len(avg_times_trend_hist), trend_len)
+        if can_predict_accuracy:
+            trend_indices_fit_acc = np.arange(trend_len - len(accuracies_trend_hist), trend_len)
         
-        self.pred_text_widget_ref = tk.Text(predictions_info_lf, height=4, width=60, relief="flat", font=("Segoe UI", 9), # Reduced H, W, Font
-                                       bg=self.colors["BG_COLOR"], fg=self.colors["TEXT_COLOR"], 
-                                       wrap=tk.WORD, borderwidth=0)
-        self.pred_text_widget_ref.pack(anchor="w", padx=3, pady=3)
-        self.pred_text_widget_ref.tag_configure("bold", font=("Segoe UI Semibold", 9)) # Reduced
-        self.pred_text_widget_ref.tag_configure("small_italic", font=("Segoe UI Italic", 7)) # Reduced
+        if reuse:
+            self.pred_text_widget_ref.config(state=tk.NORMAL)
+            self.pred_text_widget_ref.delete("1.0", tk.END)
+        else:
+            self.pred_text_widget_ref = tk.Text(predictions_info_lf, height=4, width=60, relief="flat", font=self.FONT_9, # Reduced H, W, Font
+                                           bg=self.colors["BG_COLOR"], fg=self.colors["TEXT_COLOR"], 
+                                           wrap=tk.WORD, borderwidth=0)
+            self.pred_text_widget_ref.pack(anchor="w", padx=3, pady=3)
+            self.pred_text_widget_ref.tag_configure("bold", font=("Segoe UI Semibold", 9)) # Reduced
+            self.pred_text_widget_ref.tag_configure("small_italic", font=("Segoe UI Italic", 7)) # Reduced
 
         prediction_horizon_sessions = 20 # Reduced horizon for faster calc/display
-        future_trend_indices_pred = np.arange(len(trend_history_slice), len(trend_history_slice) + prediction_horizon_sessions)
-        future_session_numbers_plot = np.arange(len(self.session_history), len(self.session_history) + prediction_horizon_sessions)
-
-        def get_randomized_fluctuation_pattern(historical_data, num_pattern_sessions, horizon_length, fit_degree=1, amplitude_variation_factor=0.2):
-            if len(historical_data) < num_pattern_sessions or num_pattern_sessions < 2:
-                return np.zeros(horizon_length) 
-
-            pattern_data = np.array(historical_data[-num_pattern_sessions:])
-            pattern_indices = np.arange(len(pattern_data))
-            
-            try:
-                p_pattern_trend = np.polyfit(pattern_indices, pattern_data, fit_degree)
-                local_trend_line = np.poly1d(p_pattern_trend)(pattern_indices)
-                residuals_base = pattern_data - local_trend_line 
-                
-                generated_fluctuations = np.zeros(horizon_length)
-                len_residuals = len(residuals_base)
-
-                for i in range(0, horizon_length, len_residuals):
-                    segment_len = min(len_residuals, horizon_length - i)
-                    random_amplitude_scale = 1.0 + random.uniform(-amplitude_variation_factor, amplitude_variation_factor)
-                    start_index_in_residuals = random.randint(0, len_residuals -1)
-                    
-                    current_segment_pattern = np.zeros(segment_len)
-                    for j in range(segment_len):
-                        current_segment_pattern[j] = residuals_base[(start_index_in_residuals + j) % len_residuals]
-
-                    generated_fluctuations[i : i + segment_len] = current_segment_pattern * random_amplitude_scale
-                
-                return generated_fluctuations
-            except np.linalg.LinAlgError: 
-                return np.zeros(horizon_length)
+        future_trend_indices_pred = np.arange(trend_len, trend_len + prediction_horizon_sessions)
+        future_session_numbers_plot = np.arange(n_sessions, n_sessions + prediction_horizon_sessions)
 
         predicted_time_30_sessions_trend = None
         poly_speed_trend = None
         speed_fluctuations = np.zeros(prediction_horizon_sessions)
 
+        fitted_together = None
+        if can_predict_speed and can_predict_accuracy and np.array_equal(trend_indices_fit_speed, trend_indices_fit_acc):
+            fitted_together = fit_lines(trend_indices_fit_speed, avg_times_trend_hist, accuracies_trend_hist) # Shared x: one fit for both
+
         if can_predict_speed:
             try:
-                degree_speed = 1 
-                p_speed = np.polyfit(trend_indices_fit_speed, avg_times_trend_hist, degree_speed)
-                poly_speed_trend = np.poly1d(p_speed)
+                poly_speed_trend = fitted_together[0] if fitted_together else fit_line(trend_indices_fit_speed, avg_times_trend_hist)
                 
                 predicted_time_30_sessions_trend = poly_speed_trend(future_trend_indices_pred[-1]) 
                 predicted_time_30_sessions_trend = max(0.5, predicted_time_30_sessions_trend) 
@@ -1267,9 +1776,7 @@ class MathSpeedTrainer:
 
         if can_predict_accuracy:
             try:
-                degree_acc = 1
-                p_acc = np.polyfit(trend_indices_fit_acc, accuracies_trend_hist, degree_acc)
-                poly_acc_trend = np.poly1d(p_acc)
+                poly_acc_trend = fitted_together[1] if fitted_together else fit_line(trend_indices_fit_acc, accuracies_trend_hist)
 
                 predicted_acc_30_sessions_trend = poly_acc_trend(future_trend_indices_pred[-1])
                 predicted_acc_30_sessions_trend = min(100.0, max(0.0, predicted_acc_30_sessions_trend)) 
@@ -1287,76 +1794,97 @@ class MathSpeedTrainer:
                 self.pred_text_widget_ref.insert(tk.END, "Accuracy (Trend): ", "bold")
                 self.pred_text_widget_ref.insert(tk.END, "N/A.\n")
         
-        self.pred_text_widget_ref.insert(tk.END, f"\nTrends: last {len(trend_history_slice)} sess. Fluctuations: last {RECENT_SESSIONS_FOR_WAVE_PATTERN} sess.", "small_italic") # Compact
+        self.pred_text_widget_ref.insert(tk.END, f"\nTrends: last {trend_len} sess. Fluctuations: last {RECENT_SESSIONS_FOR_WAVE_PATTERN} sess.", "small_italic") # Compact
         self.pred_text_widget_ref.config(state=tk.DISABLED)
 
-        vis_frame = ttk.LabelFrame(tab, text="Prediction Visualizations", padding=8) # Reduced
-        vis_frame.pack(fill=tk.BOTH, expand=True, pady=(8,0))
+        # One standard-normal draw covers both predicted lines
+        noise = self._prediction_noise
+        if noise is None or noise.size != 2 * prediction_horizon_sessions:
+            noise = self._prediction_noise = np.empty(2 * prediction_horizon_sessions)
+        self._rng.standard_normal(out=noise)
+        speed_noise, acc_noise = noise[:prediction_horizon_sessions], noise[prediction_horizon_sessions:]
+
+        # Series to plot, keyed by line; the noisy predicted parts are regenerated on every refresh
+        series = {}
+        if can_predict_speed and poly_speed_trend is not None:
+            overall_noise_amplitude_time = 0.05 * np.mean(avg_times_trend_hist) if avg_times_trend_hist.size else 0.1
+            # Trend, wave, noise and floor are applied in place on the one trend array
+            visual_future_speed_trend = poly_speed_trend(future_trend_indices_pred)
+            visual_future_speed_trend += speed_fluctuations
+            speed_noise *= overall_noise_amplitude_time
+            visual_future_speed_trend += speed_noise
+            np.maximum(visual_future_speed_trend, 0.5, out=visual_future_speed_trend)
+            series['time_hist'] = (trend_indices_fit_speed + (n_sessions - trend_len), avg_times_trend_hist) # Fit index -> session number
+            series['time_pred'] = (future_session_numbers_plot, visual_future_speed_trend)
+        if can_predict_accuracy and poly_acc_trend is not None:
+            overall_noise_amplitude_acc = 0.5 
+            visual_future_acc_trend = poly_acc_trend(future_trend_indices_pred)
+            visual_future_acc_trend += acc_fluctuations
+            acc_noise *= overall_noise_amplitude_acc
+            visual_future_acc_trend += acc_noise
+            np.clip(visual_future_acc_trend, 0, 100, out=visual_future_acc_trend)
+            series['acc_hist'] = (trend_indices_fit_acc + (n_sessions - trend_len), accuracies_trend_hist)
+            series['acc_pred'] = (future_session_numbers_plot, visual_future_acc_trend)
+        invert_time_axis = bool(can_predict_speed and np.any(avg_times_trend_hist > 0))
+
+        if reuse:
+            if info.get('layout') == (tuple(series), invert_time_axis):
+                # Same lines as before: swap their data in place
+                for key, (xs, ys) in series.items():
+                    info['lines'][key].set_data(xs, ys)
+                for ax in (info['ax1'], info['ax2']):
+                    ax.relim()
+                    ax.autoscale_view() # Inversion of the time axis and the fixed accuracy range are kept
+                info['canvas'].draw_idle()
+                return
+            vis_frame = info['vis_frame']
+            self.predictions_canvas_info = self.destroy_chart(info)
+        else:
+            vis_frame = ttk.LabelFrame(tab, text="Prediction Visualizations", padding=8) # Reduced
+            vis_frame.pack(fill=tk.BOTH, expand=True, pady=(8,0))
         
         try:
-            fig, ax1 = plt.subplots(figsize=(7, 3)) # Reduced figsize
-            fig.patch.set_facecolor(self.colors["BG_COLOR"])
-            ax1.set_facecolor(self.colors["BG_COLOR"])
+            fig = self.chart_figure("predictions", (7, 3)) # Reduced figsize
+            ax1 = fig.add_subplot(111)
+            plotted = {}
 
             color_time = self.colors["ACCENT_COLOR_RED"]
-            ax1.set_xlabel('Session Number', fontsize=8, color=self.colors["TEXT_COLOR"]) # Reduced
-            ax1.set_ylabel('Avg. Time (s)', color=color_time, fontsize=8) # Reduced
+            ax1.set_xlabel('Session Number')
+            ax1.set_ylabel('Avg. Time (s)', color=color_time)
 
-            overall_noise_amplitude_time = 0.05 * np.mean(avg_times_trend_hist) if avg_times_trend_hist else 0.1
-            overall_noise_amplitude_acc = 0.5 
-
-            if can_predict_speed and poly_speed_trend is not None:
-                ax1.plot(session_numbers_plot_trend[-len(avg_times_trend_hist):], avg_times_trend_hist, color=color_time, marker='o', linestyle='-', markersize=3, label='Recent Avg. Time') # Smaller marker
-                
-                base_future_speed_trend = poly_speed_trend(future_trend_indices_pred)
-                visual_future_speed_trend = base_future_speed_trend + speed_fluctuations
-                visual_future_speed_trend += np.random.normal(0, overall_noise_amplitude_time, len(visual_future_speed_trend))
-                visual_future_speed_trend = np.maximum(0.5, visual_future_speed_trend) 
-                
-                ax1.plot(future_session_numbers_plot, visual_future_speed_trend, color=color_time, linestyle='--', label='Predicted Avg. Time')
+            if 'time_hist' in series:
+                plotted['time_hist'], = ax1.plot(*series['time_hist'], color=color_time, marker='o', linestyle='-', markersize=3, label='Recent Avg. Time') # Smaller marker
+                plotted['time_pred'], = ax1.plot(*series['time_pred'], color=color_time, linestyle='--', label='Predicted Avg. Time')
 
-            ax1.tick_params(axis='y', labelcolor=color_time, labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-            ax1.tick_params(axis='x', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-            if can_predict_speed and any(t > 0 for t in avg_times_trend_hist): 
+            ax1.tick_params(axis='y', labelcolor=color_time)
+            if invert_time_axis: 
                  ax1.invert_yaxis() 
-            for spine in ax1.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
 
             ax2 = ax1.twinx()
             color_acc = self.colors["PRIMARY_COLOR"]
-            ax2.set_ylabel('Accuracy (%)', color=color_acc, fontsize=8) # Reduced
-
-            if can_predict_accuracy and poly_acc_trend is not None:
-                ax2.plot(session_numbers_plot_trend[-len(accuracies_trend_hist):], accuracies_trend_hist, color=color_acc, marker='s', linestyle='-', markersize=3, label='Recent Accuracy') # Smaller marker
-
-                base_future_acc_trend = poly_acc_trend(future_trend_indices_pred)
-                visual_future_acc_trend = base_future_acc_trend + acc_fluctuations
-                visual_future_acc_trend += np.random.normal(0, overall_noise_amplitude_acc, len(visual_future_acc_trend))
-                visual_future_acc_trend = np.clip(visual_future_acc_trend, 0, 100) 
+            ax2.set_ylabel('Accuracy (%)', color=color_acc)
 
-                ax2.plot(future_session_numbers_plot, visual_future_acc_trend, color=color_acc, linestyle='--', label='Predicted Accuracy')
+            if 'acc_hist' in series:
+                plotted['acc_hist'], = ax2.plot(*series['acc_hist'], color=color_acc, marker='s', linestyle='-', markersize=3, label='Recent Accuracy') # Smaller marker
+                plotted['acc_pred'], = ax2.plot(*series['acc_pred'], color=color_acc, linestyle='--', label='Predicted Accuracy')
                 
-            ax2.tick_params(axis='y', labelcolor=color_acc, labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
+            ax2.tick_params(axis='y', labelcolor=color_acc)
             ax2.set_ylim(0, 105)
-            for spine in ax2.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
             
             lines, labels = ax1.get_legend_handles_labels()
             lines2, labels2 = ax2.get_legend_handles_labels()
-            legend = ax2.legend(lines + lines2, labels + labels2, loc='lower center', bbox_to_anchor=(0.5, -0.35), ncol=2, fontsize=7, frameon=False) # Reduced, adjusted anchor
-            for text in legend.get_texts(): text.set_color(self.colors["TEXT_COLOR"])
+            ax2.legend(lines + lines2, labels + labels2, loc='lower center', bbox_to_anchor=(0.5, -0.35), ncol=2, frameon=False) # Below the axes
             
-            plt.title("Performance Trends & Prediction", fontsize=9, color=self.colors["TEXT_COLOR"]) # Reduced
-            fig.tight_layout(rect=[0, 0.12, 1, 1]) # Adjusted rect
+            ax1.set_title("Performance Trends & Prediction")
             
-            predictions_canvas_obj = FigureCanvasTkAgg(fig, master=vis_frame)
-            predictions_canvas_obj.draw()
-            predictions_canvas_obj.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-            self.predictions_canvas_info = {'canvas': predictions_canvas_obj, 'fig': fig}
+            predictions_canvas_obj = self.embed_chart(fig, vis_frame)
+            self.predictions_canvas_info = {'canvas': predictions_canvas_obj, 'fig': fig, 'ax1': ax1, 'ax2': ax2, 'lines': plotted,
+                                            'vis_frame': vis_frame, 'theme': self.theme, 'layout': (tuple(series), invert_time_axis)}
         except Exception as e:
             ttk.Label(vis_frame, text=f"Error generating chart: {e}", font=("Segoe UI", 8)).pack()
     
     def setup_settings_frame(self):
-        for widget in self.settings_frame.winfo_children():
-            widget.destroy()
+        self.empty_main_tab("settings_frame")
 
         ttk.Label(self.settings_frame, text="Application Settings", style="SubHeader.TLabel").pack(pady=(0,15), anchor="center") # Reduced
 
@@ -1371,7 +1899,7 @@ class MathSpeedTrainer:
 
         duration_lf = ttk.LabelFrame(main_settings_frame, text="Game Duration", padding=10) # Reduced
         duration_lf.pack(pady=8, fill="x", padx=15) # Reduced
-        ttk.Label(duration_lf, text="Duration (sec):", font=("Segoe UI", 9)).pack(side=tk.LEFT, padx=(0,8)) # Reduced text, padding
+        ttk.Label(duration_lf, text="Duration (sec):", font=self.FONT_9).pack(side=tk.LEFT, padx=(0,8)) # Reduced text, padding
         self.duration_var = tk.IntVar(value=self.game_duration)
         duration_spinbox = ttk.Spinbox(duration_lf, from_=30, to=300, increment=15, textvariable=self.duration_var, width=5, style="TSpinbox")
         duration_spinbox.pack(side=tk.LEFT)
@@ -1382,7 +1910,7 @@ class MathSpeedTrainer:
         op_keys = list(self.operations.keys())
         cols = 3 
         for i, op_name in enumerate(op_keys):
-            var = tk.BooleanVar(value=self.operations.get(op_name, True))
+            var = tk.BooleanVar(value=self.operations[op_name])
             self.op_vars[op_name] = var
             cb = ttk.Checkbutton(ops_lf, text=op_name.capitalize(), variable=var, style="TCheckbutton")
             cb.grid(row=i//cols, column=i%cols, sticky="w", padx=8, pady=3) # Reduced padding
@@ -1439,53 +1967,56 @@ class MathSpeedTrainer:
 
     def delete_all_data_action(self):
         try:
-            if os.path.exists(self.user_data_file):
-                os.remove(self.user_data_file)
-                print(f"User data file {self.user_data_file} deleted.")
+            for data_file in (self.user_data_file, self.sessions_file):
+                if os.path.exists(data_file):
+                    os.remove(data_file)
+                    print(f"User data file {data_file} deleted.")
         except OSError as e:
-            messagebox.showerror("Error", f"Could not delete data file: {e}\nPlease try deleting it manually:\n{self.user_data_file}", parent=self.root)
+            messagebox.showerror("Error", f"Could not delete data file: {e}\nPlease try deleting it manually:\n{self.user_data_dir}", parent=self.root)
             return 
 
         self.current_level = 1
         self.current_xp = 0
         self.xp_needed = self.calculate_xp_for_level(2)
         self.session_history = []
+        self.rebuild_session_columns()
         self.operations = { 
             "addition": True, "subtraction": True, "multiplication": True, "division": True,
             "powers": False, "roots": False, "percentages": False
         }
+        self.update_enabled_ops()
         self.answer_mode = "text"
         self.theme = "light" 
-        self.operation_stats = {
-            op: {"correct": 0, "incorrect": 0, "avg_time": 0.0, "total_answered_for_avg": 0}
-            for op in self.operations.keys()
-        }
-        self.persistently_wrong_questions = []
-        self.persistently_slow_questions = []
+        self.operation_stats = {op: self.empty_op_stats() for op in self.operations.keys()}
+        self.recount_totals()
+        self.persistently_wrong_questions.clear()
+        self.persistently_slow_questions.clear()
         self.initial_assessment_done = False 
         self.self_assessment_level = "good"
 
         messagebox.showinfo("Data Deleted", "All data deleted. Application will reset to initial state.", parent=self.root)
-        
-        for tab_frame_name in ["home_frame", "game_frame", "practice_frame", "stats_frame", "settings_frame"]:
-            if hasattr(self, tab_frame_name):
-                tab_widget = getattr(self, tab_frame_name)
-                for widget in tab_widget.winfo_children():
-                    widget.destroy()
-        
+        self.root.after_idle(self.finish_data_reset) # Rebuild once pending redraws from the dialog are flushed
+
+    def finish_data_reset(self):
         self.apply_theme()
 
+        self.notebook.pack_forget() # Rebuild the tabs unmapped, then lay them out once
         self.setup_home_frame()
         self.setup_game_frame()
         self.setup_practice_frame()
         self.setup_stats_frame()
         self.setup_settings_frame() 
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        if hasattr(self, 'notebook') and self.home_frame:
+        if self.home_frame:
             self.notebook.select(self.home_frame)
 
         self.prompt_initial_assessment()
 
+    def open_url(self, url):
+        import webbrowser # Pulls in subprocess & co.; only needed once a link is clicked
+        webbrowser.open_new_tab(url)
+
     def open_support_window(self):
         support_window = tk.Toplevel(self.root)
         support_window.title("Support Developer")
@@ -1508,7 +2039,7 @@ class MathSpeedTrainer:
         coffee_button_url = "https://buymeacoffee.com/verlorengest"
         
         coffee_btn = ttk.Button(main_frame, text="Buy me a coffee ☕", 
-                                command=lambda: webbrowser.open_new_tab(coffee_button_url),
+                                command=lambda: self.open_url(coffee_button_url),
                                 style="Pink.TButton", width=18) # Reduced width
         coffee_btn.pack(pady=8) # Reduced
 
@@ -1518,42 +2049,80 @@ class MathSpeedTrainer:
         self.root.eval(f'tk::PlaceWindow {str(support_window)} center')
         support_window.focus_set()
 
-    def setup_time_trends_tab_content(self, tab):
-        self.clear_tab_content(tab) 
-        self.setup_time_trend_charts(tab) 
+    def time_trend_series(self):
+        avg_times = self.session_column("avg_time")
+        overall = (np.arange(avg_times.size), avg_times)
+        return overall, self._op_time_series
 
-    def setup_time_trend_charts(self, parent_tab_frame):
+    def setup_time_trends_tab_content(self, tab):
+        overall, per_op = self.time_trend_series()
+        layout = (self.theme, len(overall[0]) >= 2, tuple((op_name, len(per_op[op_name][1]) >= 2) for op_name in sorted(per_op)))
+        if layout == self.time_trends_layout:
+            # Same set of charts as last time: just redraw them with the new data
+            info = self.overall_time_trend_canvas_info
+            if info:
+                info['xs'], info['ys'] = overall
+                self.draw_trend(info)
+            for op_name, info in self.op_time_trend_canvases_info.items():
+                info['xs'], info['ys'] = per_op[op_name]
+                self.draw_trend(info)
+            return
+        tab = self.clear_tab_content(tab) 
+        self.setup_time_trend_charts(tab, overall, per_op) 
+        self.time_trends_layout = layout
+
+    def create_trend_chart(self, parent, xs, ys, title, x_label, color, size, font_size):
+        """Small line chart drawn straight onto a tk.Canvas; redrawn whenever the canvas is resized."""
+        canvas = tk.Canvas(parent, width=size[0], height=size[1], bg=self.colors["BG_COLOR"], highlightthickness=0)
+        canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        info = {'canvas': canvas, 'xs': xs, 'ys': ys, 'title': title, 'x_label': x_label, 'color': color, 'font': ("Segoe UI", font_size)}
+        canvas.bind("<Configure>", lambda event: self.draw_trend(info))
+        return info
+
+    def draw_trend(self, info):
+        canvas = info['canvas']
+        canvas.delete("all")
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width < 80 or height < 60: return # Not laid out yet; <Configure> draws it once it is
+        xs, ys = np.asarray(info['xs'], dtype=np.float64), np.asarray(info['ys'], dtype=np.float64)
+        fg, font = self.colors["TEXT_COLOR"], info['font']
+        left, right = 48, width - 10
+        top, bottom = (24 if info['title'] else 8), height - 30
+
+        x_min, x_max = xs[0], xs[-1] # Session indices are ascending
+        y_min, y_max = ys.min(), ys.max()
+        if y_max == y_min:
+            y_min, y_max = y_min - 0.5, y_max + 0.5
+        x_scale = (right - left) / ((x_max - x_min) or 1)
+        y_scale = (bottom - top) / (y_max - y_min)
+        points = np.empty(2 * xs.size)
+        points[0::2] = left + (xs - x_min) * x_scale
+        points[1::2] = bottom - (ys - y_min) * y_scale
+
+        canvas.create_line(left, top, left, bottom, right, bottom, fill=fg) # Axes
+        canvas.create_line(*points.tolist(), fill=info['color'], width=2, joinstyle=tk.ROUND)
+        canvas.create_text(left - 4, top, text=f"{y_max:.1f}", anchor="e", fill=fg, font=font)
+        canvas.create_text(left - 4, bottom, text=f"{y_min:.1f}", anchor="e", fill=fg, font=font)
+        canvas.create_text(left, bottom + 3, text=f"{x_min:.0f}", anchor="n", fill=fg, font=font)
+        canvas.create_text(right, bottom + 3, text=f"{x_max:.0f}", anchor="ne", fill=fg, font=font)
+        canvas.create_text((left + right) / 2, height - 2, text=info['x_label'], anchor="s", fill=fg, font=font)
+        canvas.create_text(10, (top + bottom) / 2, text="Avg. Time (s)", angle=90, fill=fg, font=font)
+        if info['title']:
+            canvas.create_text((left + right) / 2, 4, text=info['title'], anchor="n", fill=fg, font=(font[0], font[1] + 1))
+
+    def setup_time_trend_charts(self, parent_tab_frame, overall, per_op):
         overall_time_lf = ttk.LabelFrame(parent_tab_frame, text="Overall Average Solve Time Trend", padding=8) # Reduced
         overall_time_lf.pack(fill=tk.BOTH, expand=True, pady=(8,0))
 
         if len(self.session_history) >= 2:
             try:
-                fig_overall, ax_overall = plt.subplots(figsize=(6, 2.5)) # Reduced figsize
-                fig_overall.patch.set_facecolor(self.colors["BG_COLOR"])
-                ax_overall.set_facecolor(self.colors["BG_COLOR"])
-
-                session_numbers = range(len(self.session_history))
-                avg_times_overall = [s.get('avg_time', 0) for s in self.session_history] 
-
-                ax_overall.plot(session_numbers, avg_times_overall, marker='o', linestyle='-', color=self.colors["PRIMARY_COLOR"], linewidth=1.5, markersize=3) # Smaller marker
-                ax_overall.set_xlabel("Session Number", fontsize=8, color=self.colors["TEXT_COLOR"]) # Reduced
-                ax_overall.set_ylabel("Avg. Time (s)", fontsize=8, color=self.colors["TEXT_COLOR"]) # Reduced
-                ax_overall.set_title("Overall Session Avg. Solve Time", fontsize=9, color=self.colors["TEXT_COLOR"]) # Reduced
-                ax_overall.tick_params(axis='x', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-                ax_overall.tick_params(axis='y', labelsize=7, colors=self.colors["TEXT_COLOR"]) # Reduced
-                for spine in ax_overall.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
-                if len(session_numbers) > 10: # Show fewer ticks
-                    ax_overall.xaxis.set_major_locator(plt.MaxNLocator(nbins=8, integer=True))
-                
-                plt.tight_layout(pad=1.0) # Reduced
-                canvas_overall_obj = FigureCanvasTkAgg(fig_overall, master=overall_time_lf)
-                canvas_overall_obj.draw()
-                canvas_overall_obj.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-                self.overall_time_trend_canvas_info = {'canvas': canvas_overall_obj, 'fig': fig_overall} 
+                self.overall_time_trend_canvas_info = self.create_trend_chart(
+                    overall_time_lf, *overall, "Overall Session Avg. Solve Time", "Session Number",
+                    self.colors["PRIMARY_COLOR"], (600, 250), 8) 
             except Exception as e:
                 ttk.Label(overall_time_lf, text=f"Error: {e}", font=("Segoe UI", 8)).pack()
         else:
-            ttk.Label(overall_time_lf, text="Not enough session data.", font=("Segoe UI", 9)).pack(pady=15)
+            ttk.Label(overall_time_lf, text="Not enough session data.", font=self.FONT_9).pack(pady=15)
 
         op_time_lf = ttk.LabelFrame(parent_tab_frame, text="Avg. Solve Time Trends by Operation", padding=8) # Reduced
         op_time_lf.pack(fill=tk.BOTH, expand=True, pady=(8,0))
@@ -1561,56 +2130,37 @@ class MathSpeedTrainer:
         op_trend_notebook = ttk.Notebook(op_time_lf, style="TNotebook") 
         op_trend_notebook.pack(fill=tk.BOTH, expand=True)
 
-        active_ops_with_data = set()
-        for session in self.session_history:
-            if "operations_performance" in session:
-                for op_name in session["operations_performance"].keys():
-                    active_ops_with_data.add(op_name)
-        
-        if not active_ops_with_data:
-             ttk.Label(op_time_lf, text="No per-operation time data.", font=("Segoe UI", 9)).pack(pady=15)
+        if not per_op:
+             ttk.Label(op_time_lf, text="No per-operation time data.", font=self.FONT_9).pack(pady=15)
              return
 
-        for op_name in sorted(list(active_ops_with_data)):
+        # Only the visible operation tab is drawn; the others are filled in when first selected
+        self._pending_op_trends = {}
+        for op_name in sorted(per_op):
             op_tab = ttk.Frame(op_trend_notebook, padding=3) # Reduced
             op_trend_notebook.add(op_tab, text=op_name.capitalize())
-
-            session_indices_with_op_data = []
-            op_avg_times = []
-
-            for i, session in enumerate(self.session_history):
-                if "operations_performance" in session and \
-                   op_name in session["operations_performance"] and \
-                   session["operations_performance"][op_name]["total"] > 0: 
-                    session_indices_with_op_data.append(i)
-                    op_avg_times.append(session["operations_performance"][op_name]["avg_time"])
-            
-            if len(op_avg_times) >= 2:
-                try:
-                    fig_op, ax_op = plt.subplots(figsize=(5, 2)) # Reduced figsize
-                    fig_op.patch.set_facecolor(self.colors["BG_COLOR"])
-                    ax_op.set_facecolor(self.colors["BG_COLOR"])
-
-                    ax_op.plot(session_indices_with_op_data, op_avg_times, marker='.', linestyle='-', color=self.colors["ACCENT_COLOR_GREEN"], linewidth=1.2, markersize=3) # Smaller
-                    ax_op.set_xlabel("Session #", fontsize=7, color=self.colors["TEXT_COLOR"]) # Compact
-                    ax_op.set_ylabel("Avg. Time (s)", fontsize=7, color=self.colors["TEXT_COLOR"]) # Reduced
-                    ax_op.tick_params(axis='x', labelsize=6, colors=self.colors["TEXT_COLOR"]) # Reduced
-                    ax_op.tick_params(axis='y', labelsize=6, colors=self.colors["TEXT_COLOR"]) # Reduced
-                    for spine in ax_op.spines.values(): spine.set_edgecolor(self.colors["TEXT_COLOR"])
-                    if len(session_indices_with_op_data) > 8: # Fewer ticks
-                         ax_op.xaxis.set_major_locator(plt.MaxNLocator(nbins=6, integer=True))
-
-                    plt.tight_layout(pad=0.8) # Reduced
-                    canvas_op_obj = FigureCanvasTkAgg(fig_op, master=op_tab)
-                    canvas_op_obj.draw()
-                    canvas_op_obj.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-                    self.op_time_trend_canvases_info[op_name] = {'canvas': canvas_op_obj, 'fig': fig_op}
-                except Exception as e:
-                    ttk.Label(op_tab, text=f"Error: {e}", font=("Segoe UI", 7)).pack()
-            else:
-                ttk.Label(op_tab, text=f"Not enough data for {op_name.capitalize()}.", font=("Segoe UI", 8)).pack(pady=8)
+            self._pending_op_trends[str(op_tab)] = (op_tab, op_name)
+        op_trend_notebook.bind("<<NotebookTabChanged>>", lambda event: self.build_op_trend_tab(op_trend_notebook.select()))
+        self.build_op_trend_tab(op_trend_notebook.select())
+
+    def build_op_trend_tab(self, tab_name):
+        pending = self._pending_op_trends.pop(str(tab_name), None)
+        if pending is None: return
+        op_tab, op_name = pending
+        # Read the live series so tabs opened after a refresh show current data
+        session_indices_with_op_data, op_avg_times = self._op_time_series[op_name]
+
+        if len(op_avg_times) >= 2:
+            try:
+                self.op_time_trend_canvases_info[op_name] = self.create_trend_chart(
+                    op_tab, session_indices_with_op_data, op_avg_times, None, "Session #", self.colors["ACCENT_COLOR_GREEN"], (500, 200), 7) # Compact
+            except Exception as e:
+                ttk.Label(op_tab, text=f"Error: {e}", font=("Segoe UI", 7)).pack()
+        else:
+            ttk.Label(op_tab, text=f"Not enough data for {op_name.capitalize()}.", font=("Segoe UI", 8)).pack(pady=8)
 
     def save_settings(self):
+        old_answer_mode, old_enabled_ops = self.answer_mode, self.enabled_ops
         new_theme = self.theme_var.get()
         if new_theme != self.theme:
             self.theme = new_theme
@@ -1619,23 +2169,35 @@ class MathSpeedTrainer:
         self.game_duration = self.duration_var.get()
         for op_name, var in self.op_vars.items():
             self.operations[op_name] = var.get()
+        self.update_enabled_ops()
         self.answer_mode = self.answer_mode_var.get()
         
+        self._dirty = True
         self.save_user_data() 
         messagebox.showinfo("Settings Saved", "Your settings have been saved.", parent=self.root)
         
-        if hasattr(self, 'timer_label'): self.timer_label.config(text=f"Time: {self.game_duration}s")
-        self.update_game_answer_mode_ui()
-        self.update_practice_answer_mode_ui()
-        self.update_weakness_list()
+        self.set_text(self.timer_text, f"Time: {self.game_duration}s")
+        # Only refresh the widgets whose settings actually changed
+        if self.answer_mode != old_answer_mode:
+            self.update_game_answer_mode_ui()
+            self.update_practice_answer_mode_ui()
+        if self.enabled_ops != old_enabled_ops:
+            self.update_weakness_list()
 
 
     def get_difficulty_params(self, level):
+        # The assessment is part of the key, so changing it needs no invalidation; callers only read the dict
+        key = (level, self.self_assessment_level)
+        params = self._difficulty_params_cache.get(key)
+        if params is None:
+            params = self._difficulty_params_cache[key] = self.compute_difficulty_params(level)
+        return params
+
+    def compute_difficulty_params(self, level):
         params = {"range": (1,10), "digits": 1, "mult_range": (2,10)} 
-        for min_lvl, max_lvl, p_bracket in self.difficulty_brackets:
-            if min_lvl <= level <= max_lvl:
-                params = p_bracket 
-                break 
+        bracket_idx = bisect.bisect_left(self._bracket_max_levels, level)
+        if bracket_idx < len(self.difficulty_brackets) and self.difficulty_brackets[bracket_idx][0] <= level:
+            params = self.difficulty_brackets[bracket_idx][2]
         
         if level > self.difficulty_brackets[-1][1]: 
             params = self.difficulty_brackets[-1][2].copy() 
@@ -1671,9 +2233,9 @@ class MathSpeedTrainer:
         params = self.get_difficulty_params(level)
         min_val, max_val = params["range"]
         
-        enabled_ops = [op for op, enabled in self.operations.items() if enabled]
+        enabled_ops = self.enabled_ops
         if not enabled_ops:
-            return {"text": "No ops selected!", "answer": 0, "op_type": "error", "num1":0, "num2":0, "raw_question": (0,0,"error")}
+            return QuestionDetails("No ops selected!", 0, "error", 0, 0, (0,0,"error"))
 
         if chosen_operation and chosen_operation in enabled_ops:
             op_type = chosen_operation
@@ -1681,16 +2243,17 @@ class MathSpeedTrainer:
             op_type = random.choice(enabled_ops)
         
         q_text, answer, n1, n2, raw_q = "", 0, 0, 0, None
+        randint = random.randint # Bound once; the branches below draw several numbers each
 
         if op_type == "addition":
-            n1 = random.randint(min_val, max_val)
-            n2 = random.randint(min_val, max_val)
+            n1 = randint(min_val, max_val)
+            n2 = randint(min_val, max_val)
             answer = n1 + n2
             q_text = f"{n1} + {n2} = ?"
             raw_q = (n1, n2, '+')
         elif op_type == "subtraction":
-            n1 = random.randint(min_val, max_val)
-            n2 = random.randint(min_val, n1) 
+            n1 = randint(min_val, max_val)
+            n2 = randint(min_val, n1) 
             if level < 10 and n1 < n2 : n1, n2 = n2, n1 
             answer = n1 - n2
             q_text = f"{n1} - {n2} = ?"
@@ -1699,27 +2262,28 @@ class MathSpeedTrainer:
             mult_min, mult_max = params.get("mult_range", (2,10))
             mult_min = max(1, mult_min) 
             mult_max = max(mult_min + 1, mult_max) 
-            n1 = random.randint(mult_min, mult_max)
-            n2 = random.randint(mult_min, mult_max)
-            if level <= 3: n1, n2 = random.randint(1,5), random.randint(1,5)
-            elif level <=7: n1, n2 = random.randint(1,10), random.randint(1,10)
+            n1 = randint(mult_min, mult_max)
+            n2 = randint(mult_min, mult_max)
+            if level <= 3: n1, n2 = randint(1,5), randint(1,5)
+            elif level <=7: n1, n2 = randint(1,10), randint(1,10)
             answer = n1 * n2
             q_text = f"{n1} × {n2} = ?"
             raw_q = (n1, n2, '*')
         elif op_type == "division":
-            for _ in range(100): 
-                div_min = 2 if level > 3 else 1
-                div_max = params.get("mult_range", (2,12))[1] // 2 + 1 
-                div_max = max(div_min +1, div_max)
-                n2 = random.randint(div_min, div_max) 
-                if n2 == 0: n2 = 1 
-                quotient_min = 1
-                quotient_max = params.get("mult_range", (2,12))[0] 
-                quotient_max = max(quotient_min+1, quotient_max)
-                answer_candidate = random.randint(quotient_min, quotient_max) 
-                n1 = n2 * answer_candidate 
-                if min_val <= n1 <= max_val : 
-                    answer = answer_candidate
+            div_min = 2 if level > 3 else 1
+            div_max = params.get("mult_range", (2,12))[1] // 2 + 1 
+            div_max = max(div_min +1, div_max)
+            quotient_min = 1
+            quotient_max = params.get("mult_range", (2,12))[0] 
+            quotient_max = max(quotient_min+1, quotient_max)
+            for _ in range(10): 
+                n2 = randint(div_min, div_max) 
+                # Quotients that keep the dividend within [min_val, max_val] for this divisor, sampled directly
+                lo = max(quotient_min, -(-min_val // n2))
+                hi = min(quotient_max, max_val // n2)
+                if lo <= hi:
+                    answer = randint(lo, hi)
+                    n1 = n2 * answer
                     q_text = f"{n1} ÷ {n2} = ?"
                     raw_q = (n1, n2, '/')
                     break
@@ -1728,8 +2292,8 @@ class MathSpeedTrainer:
             base_max = 15 if level < 20 else (10 if level < 30 else 20) 
             exp_max = 3 if level < 25 else (4 if level < 40 else 3) 
             base_max = max(2,base_max)
-            n1 = random.randint(2, base_max) 
-            n2 = random.randint(2, exp_max) 
+            n1 = randint(2, base_max) 
+            n2 = randint(2, exp_max) 
             try:
                 answer = n1 ** n2
                 if answer > 10000 and level < 40: 
@@ -1742,7 +2306,7 @@ class MathSpeedTrainer:
             root_type = random.choice([2, 2, 3]) 
             max_base_for_root = 20 if root_type == 2 else (10 if root_type == 3 else 15)
             max_base_for_root = max(2, max_base_for_root)
-            n1_ans = random.randint(2, max_base_for_root) 
+            n1_ans = randint(2, max_base_for_root) 
             n_val = n1_ans ** root_type
             if n_val > max_val * 2 and level < 40: 
                 return self.generate_question(level, random.choice(["addition", "subtraction"]))
@@ -1750,7 +2314,7 @@ class MathSpeedTrainer:
             q_text = f"{'√' if root_type == 2 else '∛'}{n_val} = ?"
             raw_q = (n_val, root_type, '√')
         elif op_type == "percentages" and level >= 8:
-            percent = random.randint(1, 4) * random.choice([5, 10, 20, 25]) 
+            percent = randint(1, 4) * random.choice([5, 10, 20, 25]) 
             percent = min(percent, 100) 
             base_num_options = [10, 20, 40, 50, 60, 80, 100, 120, 150, 200, 250, 300, 400, 500]
             if level > 25: base_num_options.extend([600, 750, 800, 1000])
@@ -1763,106 +2327,38 @@ class MathSpeedTrainer:
                 raw_q = (n1, n2, '%')
             else: return self.generate_question(level, random.choice(["addition", "multiplication"]))
         else: return self.generate_question(level, random.choice(["addition", "subtraction"]))
-        return {"text": q_text, "answer": answer, "op_type": op_type, "num1": n1, "num2": n2, "raw_question": raw_q}
+        return QuestionDetails(q_text, answer, op_type, n1, n2, raw_q)
 
     def generate_mc_options(self, correct_answer, level): 
-        options = {correct_answer} 
+        # Distractors are fixed multiples of one step, picked in random order: bounded work, no rejection loops
         params = self.get_difficulty_params(level)
-        
-        if correct_answer == 1:
-            possible_distractors = [0, 2, 3, correct_answer * 2, correct_answer + random.randint(1,3)]
-            if correct_answer * 10 <= 20 : possible_distractors.append(correct_answer*10) 
-            random.shuffle(possible_distractors)
-            for d in possible_distractors:
-                if len(options) < 4:
-                    options.add(d)
-        else: 
-            variation = max(1, int(correct_answer * 0.1)) 
-            variation = min(variation, params["range"][1] // 10) 
-            if variation == 0 and correct_answer != 0 : variation = 1
-            if variation == 0 and correct_answer == 0: variation = random.randint(1,5)
-            
-            attempts = 0
-            while len(options) < 4 and attempts < 20:
-                offset_type = random.choice([-1, 1, -2, 2, -0.5, 0.5, -0.1, 0.1]) 
-                offset_val = random.randint(1, variation + level//5) * offset_type
-                
-                if isinstance(correct_answer, float) or abs(offset_val) < 1: 
-                    distractor = correct_answer + offset_val
-                    if isinstance(correct_answer, int) and not math.isclose(distractor, round(distractor)):
-                         distractor = round(distractor,1) 
-                    elif isinstance(correct_answer, int):
-                         distractor = round(distractor)
-                else: 
-                    distractor = correct_answer + int(round(offset_val)) 
-
-                if distractor >= 0 or correct_answer < 0 : 
-                    options.add(distractor)
-                attempts += 1
-        
-        additional_attempts = 0
-        base_num_for_distractors = correct_answer if correct_answer != 0 else 1
-        while len(options) < 4 and additional_attempts < 20:
-            op_choice = random.choice(['add', 'sub', 'mul'])
-            val_offset = random.randint(1, 5)
-            if op_choice == 'add':
-                distractor = base_num_for_distractors + val_offset
-            elif op_choice == 'sub':
-                distractor = base_num_for_distractors - val_offset
-            else: 
-                distractor = base_num_for_distractors * random.choice([2,3,0.5]) 
-                if isinstance(correct_answer, int): distractor = round(distractor)
-
-            if distractor >= 0 or correct_answer < 0:
-                 options.add(distractor)
-            additional_attempts +=1
-
-        final_options = list(options)
-        if correct_answer not in final_options: 
-            if len(final_options) >= 4:
-                final_options.pop(random.randrange(len(final_options))) 
-            final_options.append(correct_answer)
-
-        final_options = list(dict.fromkeys(final_options)) 
-        
-        idx = 1
-        safety_break = 0
-        while len(final_options) < 4 and safety_break < 20:
-            val_to_add_plus = correct_answer + idx
-            val_to_add_minus = correct_answer - idx
-            
-            if val_to_add_plus not in final_options and (val_to_add_plus >= 0 or correct_answer < 0):
-                final_options.append(val_to_add_plus)
-            if len(final_options) == 4: break
-            
-            if val_to_add_minus not in final_options and (val_to_add_minus >= 0 or correct_answer < 0):
-                final_options.append(val_to_add_minus)
-            idx +=1
-            safety_break +=1
-            
-        last_resort_val = (max(final_options) if final_options else correct_answer) + 10
-        while len(final_options) < 4:
-            final_options.append(last_resort_val + random.randint(1,5))
-            final_options = list(dict.fromkeys(final_options)) 
-
-        random.shuffle(final_options)
-        return final_options[:4]
+        step = max(1, min(int(abs(correct_answer) * 0.1), params["range"][1] // 10))
+        options = [correct_answer]
+        for offset in random.sample(self.MC_DISTRACTOR_OFFSETS, len(self.MC_DISTRACTOR_OFFSETS)):
+            distractor = correct_answer + offset * step
+            if distractor >= 0 or correct_answer < 0: # The three positive offsets always qualify
+                options.append(distractor)
+                if len(options) == 4: break
+        random.shuffle(options)
+        return options
 
     def start_game(self):
-        if not any(self.operations.values()):
+        if not self.enabled_ops:
             messagebox.showerror("Error", "No ops selected. Enable in Settings.", parent=self.root)
             return
         self.game_active = True
         self.questions_answered = 0
         self.correct_answers = 0
-        self.session_operation_times.clear()
-        self.session_operation_correct.clear()
-        self.session_operation_incorrect.clear()
+        for op in self.session_operation_count:
+            self.session_operation_time_sum[op] = 0.0
+            self.session_operation_count[op] = 0
+            self.session_operation_correct[op] = 0
+            self.session_operation_incorrect[op] = 0
 
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         
-        self.game_end_time = time.time() + self.game_duration
+        self.game_end_time = time.monotonic() + self.game_duration # Monotonic: immune to wall-clock changes mid-game
         self.update_timer()
         self.update_game_answer_mode_ui() 
         self.next_question() 
@@ -1871,25 +2367,23 @@ class MathSpeedTrainer:
         was_active = self.game_active 
         self.game_active = False
         
-        if hasattr(self, 'text_answer_frame'): self.text_answer_frame.pack_forget()
-        if hasattr(self, 'mc_answer_frame'): self.mc_answer_frame.pack_forget()
+        if self._game_ui_built:
+            self.text_answer_frame.pack_forget()
+            self.mc_answer_frame.pack_forget()
 
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         
         if was_active and self.questions_answered > 0: 
             accuracy = (self.correct_answers / self.questions_answered) * 100
-            total_session_time_spent = 0
-            total_session_questions_for_avg = 0
-            for op_type_key in self.session_operation_times: 
-                total_session_time_spent += sum(self.session_operation_times[op_type_key])
-                total_session_questions_for_avg += len(self.session_operation_times[op_type_key])
+            total_session_time_spent = sum(self.session_operation_time_sum.values())
+            total_session_questions_for_avg = sum(self.session_operation_count.values())
             avg_time_per_q = (total_session_time_spent / total_session_questions_for_avg) if total_session_questions_for_avg > 0 else 0
 
             session_data = {
-                "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "ts": int(time.time()), # Unix seconds; formatted only for display
                 "duration_setting": self.game_duration,
-                "actual_duration": self.game_duration - max(0, self.game_end_time - time.time()) if self.game_end_time else self.game_duration,
+                "actual_duration": self.game_duration - max(0, self.game_end_time - time.monotonic()) if self.game_end_time else self.game_duration,
                 "total": self.questions_answered,
                 "correct": self.correct_answers,
                 "accuracy": accuracy,
@@ -1899,21 +2393,24 @@ class MathSpeedTrainer:
                 "operations_performance": {
                     op: {
                         "correct": self.session_operation_correct[op],
-                        "total": len(self.session_operation_times[op]), 
-                        "avg_time": np.mean(self.session_operation_times[op]) if self.session_operation_times[op] else 0
-                    } for op in self.session_operation_times 
+                        "total": count, 
+                        "avg_time": self.session_operation_time_sum[op] / count
+                    } for op, count in self.session_operation_count.items() if count
                 }
             }
             self.session_history.append(session_data)
-            summary_msg = f"Game Over!\nAnswered: {self.questions_answered}\nCorrect: {self.correct_answers} ({accuracy:.1f}%)\nAvg Time: {avg_time_per_q:.2f}s" # Compacted
-            if timed_out: summary_msg = "Time's up!\n" + summary_msg.split("\n",1)[1]
+            self.append_session_columns(session_data)
+            self.append_session_record(session_data)
+            self._dirty = True
+            header = "Time's up!" if timed_out else "Game Over!"
+            summary_msg = f"{header}\nAnswered: {self.questions_answered}\nCorrect: {self.correct_answers} ({accuracy:.1f}%)\nAvg Time: {avg_time_per_q:.2f}s" # Compacted
             messagebox.showinfo("Game Over", summary_msg, parent=self.root)
 
         elif was_active and not timed_out : 
              messagebox.showinfo("Game Stopped", "Game stopped. No questions answered.", parent=self.root)
         
         self.question_label.config(text="Press Start to begin")
-        if hasattr(self, 'answer_entry'): self.answer_entry.delete(0, tk.END)
+        if self._game_ui_built: self.answer_entry.delete(0, tk.END)
         self.save_user_data()
         self.setup_home_frame()
         self.refresh_stats()
@@ -1923,66 +2420,76 @@ class MathSpeedTrainer:
 
     def update_timer(self):
         if self.game_active:
-            remaining_time = self.game_end_time - time.time()
+            remaining_time = self.game_end_time - time.monotonic()
             if remaining_time <= 0:
-                self.timer_label.config(text="Time: 0s")
+                self.set_text(self.timer_text, "Time: 0s")
                 self.stop_game(timed_out=True)
                 return
-            self.timer_label.config(text=f"Time: {int(remaining_time)}s")
-            self.root.after(1000, self.update_timer)
+            self.set_text(self.timer_text, f"Time: {int(remaining_time)}s")
+            # Wake just after the shown second runs out instead of every 1000ms, so ticks do not drift
+            self.root.after(max(10, int((remaining_time % 1) * 1000) + 1), self.update_timer)
 
     def next_question(self):
         if not self.game_active: return
         self.current_question_details = self.generate_question(self.current_level)
-        self.question_label.config(text=self.current_question_details["text"])
-        self.question_start_time = time.time()
+        self.question_label.config(text=self.current_question_details.text)
+        self.question_start_time = time.perf_counter()
         if self.answer_mode == "text":
-            if hasattr(self, 'answer_entry'):
+            if self._game_ui_built:
                 self.answer_entry.delete(0, tk.END)
                 self.answer_entry.focus_set()
         else: 
-            options = self.generate_mc_options(self.current_question_details["answer"], self.current_level)
-            if hasattr(self, 'mc_buttons'):
-                for i, btn in enumerate(self.mc_buttons):
-                    btn.config(text=str(options[i]), state=tk.NORMAL)
-                    btn.option_value = options[i] 
+            options = self.generate_mc_options(self.current_question_details.answer, self.current_level)
+            if self._game_ui_built:
+                self.show_mc_options(self.mc_buttons, options)
+
+    def show_mc_options(self, buttons, options):
+        for btn, option in zip(buttons, options):
+            if btn.option_value != option: # Only relabel buttons whose value changed
+                btn.configure(text=str(option))
+                btn.option_value = option
+            btn.state(["!disabled"])
 
     def check_answer(self, event=None): 
-        if not self.game_active or self.answer_mode != "text" or not hasattr(self, 'answer_entry'): return
-        try:
-            user_ans_str = self.answer_entry.get().strip()
-            if not user_ans_str: return 
-            correct_answer = self.current_question_details["answer"]
-            if isinstance(correct_answer, float):
-                user_ans = float(user_ans_str)
-                is_correct = math.isclose(user_ans, correct_answer, rel_tol=1e-5)
-            else: 
-                user_ans = int(user_ans_str)
-                is_correct = (user_ans == correct_answer)
-        except ValueError: is_correct = False
-        self.process_answer_result(is_correct)
+        if not self.game_active or self.answer_mode != "text" or not self._game_ui_built: return
+        user_ans_str = self.answer_entry.get().strip()
+        if not user_ans_str: return 
+        self.process_answer_result(self.grade_text_answer(user_ans_str))
 
-    def check_mc_answer(self, choice_idx):
-        if not self.game_active or self.answer_mode != "mc" or not hasattr(self, 'mc_buttons'): return
-        chosen_option_value = self.mc_buttons[choice_idx].option_value
-        correct_answer = self.current_question_details["answer"]
+    def grade_text_answer(self, user_ans_str):
+        correct_answer = self.current_question_details.answer
         if isinstance(correct_answer, float):
-            is_correct = math.isclose(float(chosen_option_value), correct_answer, rel_tol=1e-5)
-        else: is_correct = (str(chosen_option_value) == str(correct_answer)) 
-        for btn in self.mc_buttons: btn.config(state=tk.DISABLED)
+            try: return math.isclose(float(user_ans_str), correct_answer, rel_tol=1e-5)
+            except ValueError: return False
+        # Integer answers: validate with isdecimal() (what int() accepts) rather than paying for a raised ValueError
+        digits = user_ans_str[1:] if user_ans_str[0] in "+-" else user_ans_str
+        return digits.isdecimal() and int(user_ans_str) == correct_answer
+
+    def grade_mc_answer(self, chosen_option_value):
+        correct_answer = self.current_question_details.answer
+        if isinstance(correct_answer, float):
+            return math.isclose(chosen_option_value, correct_answer, rel_tol=1e-5)
+        return chosen_option_value == correct_answer # Options are built from the answer, so plain equality; no str() round-trip
+
+    def check_mc_answer(self, choice_idx):
+        if not self.game_active or self.answer_mode != "mc" or not self._game_ui_built: return
+        is_correct = self.grade_mc_answer(self.mc_buttons[choice_idx].option_value)
+        for btn in self.mc_buttons: btn.state(["disabled"])
         self.process_answer_result(is_correct)
 
 
     def process_answer_result(self, is_correct):
         if not self.current_question_details or self.question_start_time is None: return
-        time_taken = time.time() - self.question_start_time
-        op_type = self.current_question_details["op_type"]
-        raw_question_tuple = self.current_question_details["raw_question"]
-        correct_answer_val = self.current_question_details["answer"]
+        time_taken = time.perf_counter() - self.question_start_time
+        op_type = self.current_question_details.op_type
+        raw_question_tuple = self.current_question_details.raw_question
+        correct_answer_val = self.current_question_details.answer
 
         if self.game_active or self.practice_active: 
+            self._dirty = True
             self.questions_answered += 1 
-            self.session_operation_times[op_type].append(time_taken)
+            self.session_operation_time_sum[op_type] += time_taken
+            self.session_operation_count[op_type] += 1
 
             xp_gained = 0
             if is_correct:
@@ -2000,89 +2507,72 @@ class MathSpeedTrainer:
                     self.current_xp += xp_gained
                 
                 self.operation_stats[op_type]["correct"] += 1
+                self._totals["q"] += 1
+                self._totals["correct"] += 1
 
-                if self.operation_stats[op_type]["total_answered_for_avg"] > 5: 
-                    avg_op_time = self.operation_stats[op_type]["avg_time"]
+                if self.operation_stats[op_type]["count"] > 5: 
+                    avg_op_time = self.op_avg_time(self.operation_stats[op_type])
                     is_significantly_slow = (time_taken > avg_op_time * 1.75) or \
                                             (time_taken > avg_op_time + 4 and avg_op_time > 2) 
 
                     if is_significantly_slow:
-                        already_slow = any(
-                            item['raw_q'] == raw_question_tuple and item['op_type'] == op_type 
-                            for item in self.persistently_slow_questions
-                        )
-                        if not already_slow and len(self.persistently_slow_questions) < 20: 
-                            self.persistently_slow_questions.append({
-                                'raw_q': raw_question_tuple, 
-                                'answer': correct_answer_val, 
-                                'op_type': op_type,
-                                'original_time': round(time_taken, 2),
-                                'avg_at_detection': round(avg_op_time, 2)
-                            })
+                        self.remember_question(self.persistently_slow_questions, {
+                            'raw_q': raw_question_tuple, 
+                            'answer': correct_answer_val, 
+                            'op_type': op_type,
+                            'original_time': round(time_taken, 2),
+                            'avg_at_detection': round(avg_op_time, 2)
+                        }, self.MAX_SLOW_QUESTIONS)
             else: 
                 if self.game_active or self.practice_active:
                     self.session_operation_incorrect[op_type] += 1
                 self.operation_stats[op_type]["incorrect"] += 1
+                self._totals["q"] += 1
                 
-                already_wrong = any(
-                    item['raw_q'] == raw_question_tuple and item['op_type'] == op_type
-                    for item in self.persistently_wrong_questions
-                )
-                if not already_wrong and len(self.persistently_wrong_questions) < 30: 
-                    self.persistently_wrong_questions.append({
-                        'raw_q': raw_question_tuple, 
-                        'answer': correct_answer_val, 
-                        'op_type': op_type
-                    })
-
-            prev_total_answered_for_avg = self.operation_stats[op_type]["total_answered_for_avg"]
-            prev_avg_time = self.operation_stats[op_type]["avg_time"]
-            new_total_answered_for_avg = prev_total_answered_for_avg + 1
-            self.operation_stats[op_type]["avg_time"] = \
-                ((prev_avg_time * prev_total_answered_for_avg) + time_taken) / new_total_answered_for_avg
-            self.operation_stats[op_type]["total_answered_for_avg"] = new_total_answered_for_avg
+                self.remember_question(self.persistently_wrong_questions, {
+                    'raw_q': raw_question_tuple, 
+                    'answer': correct_answer_val, 
+                    'op_type': op_type
+                }, self.MAX_WRONG_QUESTIONS)
+
+            self.operation_stats[op_type]["sum_time"] += time_taken
+            self.operation_stats[op_type]["count"] += 1
 
         if self.game_active:
             self.update_xp_and_level()
-            if hasattr(self, 'score_label'): self.score_label.config(text=f"Score: {self.correct_answers}/{self.questions_answered}")
+            self.set_text(self.score_text, f"Score: {self.correct_answers}/{self.questions_answered}")
             self.next_question()
         elif self.practice_active: 
             self.practice_questions_answered +=1
             if is_correct: self.practice_correct_answers +=1
             
-            feedback_text = "Correct!" if is_correct else f"Incorrect. Ans: {self.current_question_details['answer']}" # Compacted
+            feedback_text = "Correct!" if is_correct else f"Incorrect. Ans: {self.current_question_details.answer}" # Compacted
             feedback_color = self.colors["ACCENT_COLOR_GREEN"] if is_correct else self.colors["ACCENT_COLOR_RED"]
             
-            if hasattr(self, 'practice_feedback_label'): self.practice_feedback_label.config(text=feedback_text, foreground=feedback_color)
+            if self._practice_ui_built: self.practice_feedback_label.config(text=feedback_text, foreground=feedback_color)
             
             if self.current_practice_type == "wrong_ones" and is_correct:
-                q_to_remove = {'raw_q': raw_question_tuple, 'op_type': op_type} 
-                self.persistently_wrong_questions = [
-                    q for q in self.persistently_wrong_questions if not (q['raw_q'] == q_to_remove['raw_q'] and q['op_type'] == q_to_remove['op_type'])
-                ]
-                self.save_user_data() 
+                self.persistently_wrong_questions.pop(self.question_key(raw_question_tuple, op_type), None)
+                self.request_save()
                 feedback_text += " (Removed!)" # Compact
-                if hasattr(self, 'practice_feedback_label'): self.practice_feedback_label.config(text=feedback_text)
+                if self._practice_ui_built: self.practice_feedback_label.config(text=feedback_text)
 
             elif self.current_practice_type == "slow_ones":
-                q_to_remove = {'raw_q': raw_question_tuple, 'op_type': op_type}
-                self.persistently_slow_questions = [
-                    q for q in self.persistently_slow_questions if not (q['raw_q'] == q_to_remove['raw_q'] and q['op_type'] == q_to_remove['op_type'])
-                ]
-                self.save_user_data()
+                self.persistently_slow_questions.pop(self.question_key(raw_question_tuple, op_type), None)
+                self.request_save()
                 if is_correct:
                     feedback_text += " (Re-attempted.)" # Compact
-                    if hasattr(self, 'practice_feedback_label'): self.practice_feedback_label.config(text=feedback_text)
+                    if self._practice_ui_built: self.practice_feedback_label.config(text=feedback_text)
 
             if self.answer_mode == "text":
-                if hasattr(self, 'practice_answer_entry'): self.practice_answer_entry.config(state=tk.DISABLED)
-                if hasattr(self, 'practice_submit_button'): self.practice_submit_button.pack_forget()
+                if self._practice_ui_built:
+                    self.practice_answer_entry.config(state=tk.DISABLED)
             else:
-                if hasattr(self, 'practice_mc_buttons'):
-                    for btn in self.practice_mc_buttons: btn.config(state=tk.DISABLED)
+                if self._practice_ui_built:
+                    for btn in self.practice_mc_buttons: btn.state(["disabled"])
             
-            if hasattr(self, 'next_practice_q_button'):
-                self.next_practice_q_button.pack(side=tk.LEFT, padx=3)
+            if self._practice_ui_built:
+                self.show_practice_buttons(submit=False, next_q=True)
                 self.next_practice_q_button.focus_set()
 
 
@@ -2095,99 +2585,69 @@ class MathSpeedTrainer:
             leveled_up = True
         if leveled_up: messagebox.showinfo("Level Up!", f"Congrats! Reached Level {self.current_level}!", parent=self.root) # Compacted
         self.update_xp_display()
-        if hasattr(self, 'game_level_label'):
-            self.game_level_label.config(text=f"Level: {self.current_level}")
 
     def next_practice_question(self):
         if not self.practice_active or self.practice_questions_answered >= self.practice_questions_total:
             self.end_practice_session()
             return
 
+        hint_text = None
+        preset_options = None
         if self.current_practice_type == "targeted_op":
             self.current_question_details = self.generate_question(self.current_level, self.current_practice_op_for_session)
         
         elif self.current_practice_type in ["wrong_ones", "slow_ones"]:
-            if not self.current_practice_list: 
-                self.end_practice_session()
-                return
-            
-            # Make sure we don't go out of bounds if list shrank and answered count is high
-            if self.practice_questions_answered >= len(self.current_practice_list):
+            try:
+                question_data, preset_options = next(self._practice_iter)
+            except StopIteration:
                 self.end_practice_session()
                 return
-
-            question_data = self.current_practice_list[self.practice_questions_answered] 
             raw_q = question_data['raw_q']
             n1, n2, op_char_from_raw = raw_q[0], raw_q[1], raw_q[2]
             
-            q_text_display = f"{n1} {op_char_from_raw} {n2} = ?"
-            if question_data['op_type'] == "powers": q_text_display = f"{n1}^{n2} = ?"
-            elif question_data['op_type'] == "roots": q_text_display = f"{'√' if n2==2 else '∛'}{n1} = ?" 
-            elif question_data['op_type'] == "percentages": q_text_display = f"{n1}% of {n2} = ?"
-
-            self.current_question_details = {
-                "text": q_text_display, "answer": question_data['answer'],
-                "op_type": question_data['op_type'], "num1": n1, "num2": n2, 
-                "raw_question": raw_q 
-            }
+            op_type = question_data['op_type']
+            if op_type == "roots": op_type = "roots_sq" if n2 == 2 else "roots_cu"
+            q_text_display = self._PRACTICE_Q_FORMATS.get(op_type, "{0} {2} {1} = ?").format(n1, n2, op_char_from_raw)
+
+            self.current_question_details = QuestionDetails(
+                q_text_display, question_data['answer'], question_data['op_type'], n1, n2, raw_q
+            )
             if self.current_practice_type == "slow_ones" and 'original_time' in question_data:
-                 self.hint_label.config(text=f"Original: {question_data['original_time']}s (Avg: {question_data.get('avg_at_detection','N/A')}s)") # Compact
-            else:
-                 if hasattr(self, 'hint_label'): self.hint_label.config(text=self.generate_hint())
+                 hint_text = f"Original: {question_data['original_time']}s (Avg: {question_data.get('avg_at_detection','N/A')}s)" # Compact
         else: 
             self.current_question_details = self.generate_question(self.current_level, "addition")
 
-        if hasattr(self, 'practice_question_label'): self.practice_question_label.config(text=self.current_question_details["text"])
-        if self.current_practice_type != "slow_ones": 
-            if hasattr(self, 'hint_label'): self.hint_label.config(text=self.generate_hint())
-
-        if hasattr(self, 'practice_feedback_label'): self.practice_feedback_label.config(text="") 
-        self.question_start_time = time.time()
+        if self._practice_ui_built:
+            # Each label is written once per question
+            self.practice_question_label.config(text=self.current_question_details.text)
+            self.hint_label.config(text=hint_text if hint_text is not None else self.generate_hint())
+            self.practice_feedback_label.config(text="") 
+        self.question_start_time = time.perf_counter()
 
         if self.answer_mode == "text":
-            if hasattr(self, 'practice_answer_entry'):
+            if self._practice_ui_built:
                 self.practice_answer_entry.config(state=tk.NORMAL)
                 self.practice_answer_entry.delete(0, tk.END)
                 self.practice_answer_entry.focus_set()
             # Submit button shown based on update_practice_answer_mode_ui state
         else: 
-            options = self.generate_mc_options(self.current_question_details["answer"], self.current_level)
-            if hasattr(self, 'practice_mc_buttons'):
-                for i, btn in enumerate(self.practice_mc_buttons):
-                    btn.config(text=str(options[i]), state=tk.NORMAL)
-                    btn.option_value = options[i]
+            options = preset_options or self.generate_mc_options(self.current_question_details.answer, self.current_level)
+            if self._practice_ui_built:
+                self.show_mc_options(self.practice_mc_buttons, options)
 
-        # Logic for showing/hiding submit/next is in update_practice_answer_mode_ui
+        # Feedback was just cleared, so this hides Next and shows Submit for text input
         self.update_practice_answer_mode_ui()
-        # Specifically ensure next button is hidden before an answer is submitted
-        if hasattr(self, 'next_practice_q_button'): self.next_practice_q_button.pack_forget()
-        if self.answer_mode == "text" and hasattr(self, 'practice_submit_button'): # Ensure submit button is shown for text input
-            self.practice_submit_button.pack(side=tk.LEFT, padx=3)
 
 
     def check_practice_answer(self, event=None): 
-        if not self.practice_active or self.answer_mode != "text" or not hasattr(self, 'practice_answer_entry'): return
-        try:
-            user_ans_str = self.practice_answer_entry.get().strip()
-            if not user_ans_str: return
-            correct_answer = self.current_question_details["answer"]
-            if isinstance(correct_answer, float):
-                user_ans = float(user_ans_str)
-                is_correct = math.isclose(user_ans, correct_answer, rel_tol=1e-5)
-            else:
-                user_ans = int(user_ans_str)
-                is_correct = (user_ans == correct_answer)
-        except ValueError: is_correct = False
-        self.process_answer_result(is_correct)
+        if not self.practice_active or self.answer_mode != "text" or not self._practice_ui_built: return
+        user_ans_str = self.practice_answer_entry.get().strip()
+        if not user_ans_str: return
+        self.process_answer_result(self.grade_text_answer(user_ans_str))
 
     def check_practice_mc_answer(self, choice_idx):
-        if not self.practice_active or self.answer_mode != "mc" or not hasattr(self, 'practice_mc_buttons'): return
-        chosen_option_value = self.practice_mc_buttons[choice_idx].option_value
-        correct_answer = self.current_question_details["answer"]
-        if isinstance(correct_answer, float):
-            is_correct = math.isclose(float(chosen_option_value), correct_answer, rel_tol=1e-5)
-        else: is_correct = (str(chosen_option_value) == str(correct_answer))
-        self.process_answer_result(is_correct)
+        if not self.practice_active or self.answer_mode != "mc" or not self._practice_ui_built: return
+        self.process_answer_result(self.grade_mc_answer(self.practice_mc_buttons[choice_idx].option_value))
 
 
     def end_practice_session(self):
@@ -2202,13 +2662,16 @@ class MathSpeedTrainer:
                             f"Session finished!\nType: {practice_type_msg}\n" # Compacted
                             f"Answered: {self.practice_correct_answers}/{self.practice_questions_total} ({accuracy:.0f}%)", parent=self.root) # Use .0f for acc
         
-        if hasattr(self, 'practice_area'): self.practice_area.pack_forget()
-        if hasattr(self, 'options_main_frame_practice'): self.options_main_frame_practice.pack(fill=tk.X, pady=(0,10)) 
-        if hasattr(self, 'stop_practice_button'): self.stop_practice_button.pack_forget()
+        if self._practice_ui_built:
+            self.practice_area.pack_forget()
+            self.options_main_frame_practice.pack(fill=tk.X, pady=(0,10)) 
+            self.stop_practice_button.pack_forget()
 
 
         self.current_practice_type = None 
         self.current_practice_list = []
+        self.current_practice_mc_options = None
+        self._practice_iter = None
         self.current_practice_op_for_session = None
 
         self.save_user_data()
@@ -2218,39 +2681,52 @@ class MathSpeedTrainer:
     def generate_hint(self):
         if not self.current_question_details: return ""
         q_details = self.current_question_details
-        op, raw_q = q_details["op_type"], q_details.get("raw_question")
+        op, raw_q = q_details.op_type, q_details.raw_question
         if raw_q is None: return "Hint: Check numbers." # Compact
         val1, val2, op_char = raw_q
-        hint_text = ""
-        # Hints are kept mostly the same for brevity, can be further compacted if needed
-        if op == "addition":
-            if val1 > 10 and val2 > 10 and random.random() > 0.3: hint_text = f"Try: ({val1//10*10} + {val2//10*10}) + ({val1%10} + {val2%10})."
-            else: hint_text = "Hint: Count up from larger #." # Compact
-        elif op == "subtraction":
-            if val2 > 10 and val1 - val2 > 10 and random.random() > 0.3: hint_text = f"Try: {val1} - {val2//10*10}, then subtract {val2%10}."
-            else: hint_text = f"Hint: What + {val2} = {val1}?"
-        elif op == "multiplication":
-            if val2 == 10: hint_text = f"Hint: {val1} × 10 = {val1}0."
-            elif val2 == 11 and val1 < 100: hint_text = f"Try: ({val1}×10) + {val1}."
-            elif val2 == 5: hint_text = f"Try: ({val1}×10) ÷ 2."
-            elif val2 == 25: hint_text = f"Try: ({val1}×100) ÷ 4."
-            elif val1 > 10 and val2 > 10 and (val2 % 10 != 0) and abs(val2 - round(val2,-1)) <=2 and random.random() > 0.4 :
-                near_ten, diff = round(val2, -1), val2 - round(val2, -1)
-                op_sign = "+" if diff >= 0 else "-"
-                hint_text = f"Try: {val1}×({near_ten}{op_sign}{abs(diff)})"
-            else: hint_text = "Hint: Break down a number." # Compact
-        elif op == "division":
-            hint_text = f"Hint: What × {val2} = {val1}?"
-            if val2 !=0 and val1 % val2 == 0 and val1/val2 < 12 and val2 < 12 and random.random() > 0.3: hint_text += f"\nUse {val2} times table."
-        elif op == "powers":
-            hint_text = f"Hint: {val1} × itself {val2} times." # Compact
-        elif op == "roots":
-            hint_text = f"Hint: What # × itself {val2} times = {val1}?" # Compact
-        elif op == "percentages":
-            hint_text = f"Hint: ({val1}/100) × {val2}." # Compact
-            if val1 % 10 == 0 and random.random() > 0.3: hint_text += f"\n10% of {val2} is {val2/10}. You need {val1//10} of these."
+        builder = self._hint_builders.get(op)
+        hint_text = builder(val1, val2) if builder else ""
         return hint_text if hint_text else "Hint: Step by step!" # Compact
 
+    # Hint text per operation, looked up through self._hint_builders
+    def hint_addition(self, val1, val2):
+        if val1 > 10 and val2 > 10 and random.random() > 0.3: return f"Try: ({val1//10*10} + {val2//10*10}) + ({val1%10} + {val2%10})."
+        return "Hint: Count up from larger #." # Compact
+
+    def hint_subtraction(self, val1, val2):
+        if val2 > 10 and val1 - val2 > 10 and random.random() > 0.3: return f"Try: {val1} - {val2//10*10}, then subtract {val2%10}."
+        return f"Hint: What + {val2} = {val1}?"
+
+    _MULT_HINTS = {10: "Hint: {0} × 10 = {0}0.", 5: "Try: ({0}×10) ÷ 2.", 25: "Try: ({0}×100) ÷ 4."}
+
+    def hint_multiplication(self, val1, val2):
+        template = self._MULT_HINTS.get(val2)
+        if template: return template.format(val1)
+        if val2 == 11 and val1 < 100: return f"Try: ({val1}×10) + {val1}."
+        tens, ones = divmod(val2, 10)
+        if val1 > 10 and val2 > 10 and ones in (1, 2, 8, 9) and random.random() > 0.4: # Within 2 of a multiple of ten
+            near_ten = tens * 10 if ones <= 2 else tens * 10 + 10
+            diff = val2 - near_ten
+            op_sign = "+" if diff >= 0 else "-"
+            return f"Try: {val1}×({near_ten}{op_sign}{abs(diff)})"
+        return "Hint: Break down a number." # Compact
+
+    def hint_division(self, val1, val2):
+        hint_text = f"Hint: What × {val2} = {val1}?"
+        if val2 !=0 and val1 % val2 == 0 and val1/val2 < 12 and val2 < 12 and random.random() > 0.3: hint_text += f"\nUse {val2} times table."
+        return hint_text
+
+    def hint_powers(self, val1, val2):
+        return f"Hint: {val1} × itself {val2} times." # Compact
+
+    def hint_roots(self, val1, val2):
+        return f"Hint: What # × itself {val2} times = {val1}?" # Compact
+
+    def hint_percentages(self, val1, val2):
+        hint_text = f"Hint: ({val1}/100) × {val2}." # Compact
+        if val1 % 10 == 0 and random.random() > 0.3: hint_text += f"\n10% of {val2} is {val2/10}. You need {val1//10} of these."
+        return hint_text
+
 if __name__ == "__main__":
     MY_APP_ID = "KaanSoyler.MathSpeedTrainer.MST.1.0" 
     set_app_user_model_id(MY_APP_ID)
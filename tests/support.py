@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import MathTrainer as mt
+
+
+@contextmanager
+def trainer(data_dir=None):
+    """Yields a MathSpeedTrainer built with Tk mocked out and its user data kept in data_dir (a temp dir by default)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(data_dir or tmp)
+        with mock.patch.dict(os.environ, {"APPDATA": str(data_dir), "XDG_CONFIG_HOME": str(data_dir)}), \
+                mock.patch.object(mt.Path, "home", return_value=data_dir), \
+                mock.patch.object(mt, "tk", mock.MagicMock()), \
+                mock.patch.object(mt, "ttk", mock.MagicMock()), \
+                mock.patch.object(mt, "messagebox", mock.MagicMock()):
+            yield mt.MathSpeedTrainer(mock.MagicMock())
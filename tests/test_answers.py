@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from support import mt, trainer
+
+
+class MultipleChoiceOptionsTest(unittest.TestCase):
+    def assert_valid_options(self, app, answer, level):
+        options = app.generate_mc_options(answer, level)
+        self.assertEqual(len(options), 4, options)
+        self.assertEqual(len(set(options)), 4, options)
+        self.assertIn(answer, options)
+        if answer >= 0:
+            self.assertTrue(all(option >= 0 for option in options), options)
+
+    def test_four_unique_options_including_the_answer(self):
+        random.seed(1234)
+        with trainer() as app:
+            for level in (1, 8, 25, 60, 100):
+                for answer in (0, 1, 2, 7, 10, 99, 1000, 123456):
+                    for _ in range(20):
+                        self.assert_valid_options(app, answer, level)
+
+    def test_negative_answers(self):
+        random.seed(99)
+        with trainer() as app:
+            for answer in (-1, -5, -40, -999):
+                for _ in range(20):
+                    self.assert_valid_options(app, answer, 10)
+
+    def test_float_answers(self):
+        random.seed(7)
+        with trainer() as app:
+            for answer in (0.5, 12.25, 80.0):
+                self.assert_valid_options(app, answer, 20)
+
+
+class GradeTextAnswerTest(unittest.TestCase):
+    def grade(self, answer, typed):
+        with trainer() as app:
+            app.current_question_details = mt.QuestionDetails("?", answer, "addition", 0, 0, None)
+            return app.grade_text_answer(typed)
+
+    def test_integer_answers(self):
+        self.assertTrue(self.grade(42, "42"))
+        self.assertTrue(self.grade(42, "+42"))
+        self.assertTrue(self.grade(42, "042"))
+        self.assertTrue(self.grade(-7, "-7"))
+        self.assertTrue(self.grade(0, "0"))
+        self.assertTrue(self.grade(0, "-0"))
+        self.assertFalse(self.grade(42, "41"))
+        self.assertFalse(self.grade(-7, "7"))
+
+    def test_malformed_integer_input_is_wrong_not_an_error(self):
+        for typed in ("-", "+", "4 2", "4.0", "42a", "--42", "1e2", "abc"):
+            self.assertFalse(self.grade(42, typed), typed)
+
+    def test_float_answers_use_a_tolerance(self):
+        self.assertTrue(self.grade(12.5, "12.5"))
+        self.assertTrue(self.grade(1 / 3, "0.333333333"))
+        self.assertTrue(self.grade(80.0, "80"))
+        self.assertFalse(self.grade(12.5, "12.6"))
+        self.assertFalse(self.grade(12.5, "twelve"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from support import mt
+
+
+class FitLinesTest(unittest.TestCase):
+    def assert_matches_polyfit(self, x, y, line):
+        slope, intercept = np.polyfit(x, y, 1)
+        xs = np.asarray(x, dtype=np.float64)
+        np.testing.assert_allclose(line(xs), slope * xs + intercept, rtol=1e-9, atol=1e-9)
+
+    def test_fit_line_matches_polyfit(self):
+        rng = np.random.default_rng(0)
+        x = np.arange(1, 11)
+        y = 3.5 - 0.2 * x + rng.normal(0, 0.3, x.size)
+        self.assert_matches_polyfit(x, y, mt.fit_line(x, y))
+
+    def test_fit_lines_fits_each_series(self):
+        x = [0, 2, 3, 7, 8]
+        ys = ([1.0, 2.5, 2.0, 6.0, 7.5], [90, 85, 88, 70, 65], [4, 4, 4, 4, 4])
+        lines = mt.fit_lines(x, *ys)
+        self.assertEqual(len(lines), len(ys))
+        for y, line in zip(ys, lines):
+            self.assert_matches_polyfit(x, y, line)
+
+    def test_fit_line_on_integer_input_and_scalar_call(self):
+        line = mt.fit_line([1, 2, 3], [2, 4, 6])
+        self.assertAlmostEqual(line(4), 8.0)
+
+    def test_constant_x_gives_flat_line_through_mean(self):
+        line = mt.fit_line([5, 5, 5], [1.0, 2.0, 6.0])
+        self.assertAlmostEqual(line(0), 3.0)
+        self.assertAlmostEqual(line(100), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,16 @@
+import unittest
+
+from support import trainer
+
+
+class StartupTest(unittest.TestCase):
+    """Runs MathSpeedTrainer.__init__ end to end, so a change that breaks launch fails here."""
+
+    def test_constructor_runs(self):
+        with trainer() as app:
+            self.assertEqual(set(app.operation_stats), set(app.operations))
+            self.assertEqual(app.current_level, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import tempfile
+import unittest
+from datetime import datetime
+
+from support import mt, trainer
+
+
+def write_legacy_user_data(data_dir, user_data):
+    # A first launch only tells us where this platform keeps the files
+    with trainer(data_dir) as app:
+        user_data_file, sessions_file = app.user_data_file, app.sessions_file
+    user_data_file.write_text(json.dumps(user_data), encoding="utf-8")
+    sessions_file.unlink(missing_ok=True)
+    return user_data_file, sessions_file
+
+
+class OperationStatsMigrationTest(unittest.TestCase):
+    def test_running_average_becomes_sum_and_count(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_legacy_user_data(data_dir, {
+                "level": 4,
+                "operation_stats": {
+                    "addition": {"correct": 8, "incorrect": 2, "avg_time": 2.5, "total_answered_for_avg": 10},
+                    "division": {"correct": 0, "incorrect": 0, "avg_time": 0.0, "total_answered_for_avg": 0},
+                },
+            })
+            with trainer(data_dir) as app:
+                mt.messagebox.showerror.assert_not_called()
+                self.assertEqual(app.current_level, 4)
+                self.assertEqual(app.operation_stats["addition"], {"correct": 8, "incorrect": 2, "sum_time": 25.0, "count": 10})
+                self.assertEqual(app.operation_stats["division"], {"correct": 0, "incorrect": 0, "sum_time": 0.0, "count": 0})
+                self.assertEqual(app.operation_stats["powers"], app.empty_op_stats()) # Missing ops start empty
+                self.assertAlmostEqual(app.op_avg_time(app.operation_stats["addition"]), 2.5)
+                self.assertEqual(app._totals, {"q": 10, "correct": 8})
+
+    def test_current_format_loads_unchanged(self):
+        stats = {"correct": 3, "incorrect": 1, "sum_time": 6.0, "count": 4}
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_legacy_user_data(data_dir, {"operation_stats": {"subtraction": dict(stats)}})
+            with trainer(data_dir) as app:
+                self.assertEqual(app.operation_stats["subtraction"], stats)
+
+
+class SessionHistoryMigrationTest(unittest.TestCase):
+    LEGACY_HISTORY = [
+        {"date": "2024-03-01 09:15:42", "level": 2, "accuracy": 80.0, "avg_time": 3.1},
+        {"date": "2024-03-02 18:00:05", "level": 3, "accuracy": 92.5, "avg_time": 2.4},
+    ]
+
+    def test_history_moves_to_sessions_file_and_reloads(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            user_data_file, sessions_file = write_legacy_user_data(data_dir, {"level": 3, "session_history": self.LEGACY_HISTORY})
+
+            with trainer(data_dir) as app:
+                mt.messagebox.showerror.assert_not_called()
+                expected = [
+                    {"ts": int(datetime.strptime(s["date"][:16], "%Y-%m-%d %H:%M").timestamp()),
+                     **{k: v for k, v in s.items() if k != "date"}}
+                    for s in self.LEGACY_HISTORY
+                ]
+                self.assertEqual(app.session_history, expected)
+                self.assertTrue(sessions_file.exists())
+                self.assertTrue(app._dirty) # The old copy is dropped from the main file on the next save
+                app.save_user_data()
+            self.assertNotIn("session_history", json.loads(user_data_file.read_text(encoding="utf-8")))
+            written = [json.loads(line) for line in sessions_file.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(written, expected)
+
+            with trainer(data_dir) as app:
+                mt.messagebox.showerror.assert_not_called()
+                self.assertEqual(app.session_history, expected)
+                self.assertEqual(app.format_session_date(app.session_history[0]), "2024-03-01 09:15")
+
+    def test_appended_sessions_survive_a_reload(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_legacy_user_data(data_dir, {"session_history": self.LEGACY_HISTORY})
+            with trainer(data_dir) as app:
+                new_session = {"ts": 1717171717, "level": 3, "accuracy": 100.0, "avg_time": 1.9}
+                app.session_history.append(new_session)
+                app.append_session_record(new_session)
+                expected = list(app.session_history)
+                self.assertEqual(len(expected), 3)
+            with trainer(data_dir) as app:
+                self.assertEqual(app.session_history, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()